@@ -7,7 +7,7 @@ import json
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Protocol, Union
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
 
 from logger_config import get_logger
 
@@ -26,9 +26,9 @@ class AgentType(Enum):
     SUPERVISOR = "supervisor"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class APIConfig:
-    """Unified API configuration."""
+    """Unified API configuration (immutable; ``to_dict`` scalars are computed once)."""
 
     provider: str
     base_url: str
@@ -58,17 +58,31 @@ class APIConfig:
     skill_include_globs: List[str] = field(
         default_factory=lambda: ["*.md", "*.txt", "*.rst", "*.yaml", "*.yml"]
     )
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def model_name(self) -> str:
         """Compatibility alias used by AgentConfig and llm_client."""
         return self.model
 
-    @model_name.setter
-    def model_name(self, value: str) -> None:
-        self.model = value
-
     def to_dict(self) -> Dict[str, Any]:
+        """Return the masked dict; scalar entries are built on first call.
+
+        ``frozen`` does not freeze the list fields, so they are copied from
+        the live values on every call instead of being shared with the cache.
+        """
+        cached = self._dict_cache
+        if cached is None:
+            cached = self._build_dict()
+            object.__setattr__(self, "_dict_cache", cached)
+        data = dict(cached)
+        for name in _API_CONFIG_LIST_FIELDS:
+            data[name] = list(getattr(self, name))
+        return data
+
+    def _build_dict(self) -> Dict[str, Any]:
         return {
             "provider": self.provider,
             "base_url": self.base_url,
@@ -96,14 +110,17 @@ class APIConfig:
         }
 
 
-@dataclass
+_API_CONFIG_LIST_FIELDS = ("rag_paths", "rag_include_globs", "skill_paths", "skill_include_globs")
+
+
+@dataclass(slots=True)
 class RedoRequest:
     target_agent: str
     reason: str
     stage: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SupervisorFeedback:
     agent: str
     score: float
@@ -136,12 +153,20 @@ class BaseAgent:
         self.version = version
         self.api_config: Optional[Any] = None
         self.supervisor_feedback: Optional[Union[str, SupervisorFeedback]] = None
+        # (feedback object, rendered section); rebuilt when supervisor_feedback is replaced
+        self._feedback_prompt_cache: Optional[Tuple[Any, str]] = None
+        agent_type_str = getattr(agent_type, "value", agent_type)
+        self._repr = (
+            f"<{self.__class__.__name__}(name='{name}', "
+            f"type={agent_type_str}, version={version})>"
+        )
 
     def set_api_config(self, config: Any) -> None:
         self.api_config = config
 
     def set_supervisor_feedback(self, feedback: Union[str, SupervisorFeedback]) -> None:
         self.supervisor_feedback = feedback
+        self._feedback_prompt_cache = (feedback, self._render_feedback_section(feedback))
 
     @staticmethod
     def _find_matching_brace(text: str, start: int) -> int:
@@ -173,33 +198,43 @@ class BaseAgent:
         return -1
 
     def _get_feedback_prompt_section(self) -> str:
-        if not self.supervisor_feedback:
+        feedback = self.supervisor_feedback
+        cached = self._feedback_prompt_cache
+        if cached is not None and cached[0] is feedback:
+            return cached[1]
+
+        section = self._render_feedback_section(feedback)
+        self._feedback_prompt_cache = (feedback, section)
+        return section
+
+    @staticmethod
+    def _render_feedback_section(feedback: Optional[Union[str, SupervisorFeedback]]) -> str:
+        if not feedback:
             return ""
 
-        if isinstance(self.supervisor_feedback, str):
-            feedback = self.supervisor_feedback
+        if isinstance(feedback, str):
             if len(feedback) > 5000:
                 feedback = feedback[:5000] + "\n...(反馈过长已截断)"
             return f"\n\n【监督 Agent 反馈 - 请务必根据以下意见改进输出】\n{feedback}"
 
         feedback_lines = [
             "\n\n【监督 Agent 反馈 - 请务必根据以下意见改进输出】",
-            f"评分: {self.supervisor_feedback.score}/100",
+            f"评分: {feedback.score}/100",
         ]
 
-        if self.supervisor_feedback.strengths:
+        if feedback.strengths:
             feedback_lines.append("优点:")
-            for item in self.supervisor_feedback.strengths[:5]:
+            for item in feedback.strengths[:5]:
                 feedback_lines.append(f"  - {item[:200]}")
 
-        if self.supervisor_feedback.weaknesses:
+        if feedback.weaknesses:
             feedback_lines.append("缺点:")
-            for item in self.supervisor_feedback.weaknesses[:8]:
+            for item in feedback.weaknesses[:8]:
                 feedback_lines.append(f"  - {item[:200]}")
 
-        if self.supervisor_feedback.suggestions:
+        if feedback.suggestions:
             feedback_lines.append("改进建议:")
-            for item in self.supervisor_feedback.suggestions[:8]:
+            for item in feedback.suggestions[:8]:
                 feedback_lines.append(f"  - {item[:300]}")
 
         return "\n".join(feedback_lines)
@@ -349,11 +384,4 @@ class BaseAgent:
         )
 
     def __repr__(self) -> str:
-        if hasattr(self.agent_type, "value"):
-            agent_type_str = getattr(self.agent_type, "value")
-        else:
-            agent_type_str = str(self.agent_type)
-        return (
-            f"<{self.__class__.__name__}(name='{self.name}', "
-            f"type={agent_type_str}, version={self.version})>"
-        )
+        return self._repr
@@ -5,12 +5,15 @@
 
 import time
 import uuid
+import bisect
 import logging
+import operator
+import functools
 import threading
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Deque, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, cast, overload
 
+from core.events import Event
 from core.research_orchestrator import ResearchOrchestrator
 from core.workflow_engine import WorkflowState
 from core.agent_history import AgentHistory
@@ -18,32 +21,132 @@ from core.agent_history import AgentHistory
 logger = logging.getLogger(__name__)
 MAX_EVENT_LOG = 2000
 
+# 可被清理的终态 / 计入活跃数的运行态
+TERMINAL_STATES: frozenset = frozenset({
+    WorkflowState.COMPLETED, WorkflowState.ERROR, WorkflowState.STOPPED,
+})
+ACTIVE_STATES: frozenset = frozenset({
+    WorkflowState.RUNNING, WorkflowState.WAITING_CONFIRMATION,
+})
 
-@dataclass
+
+class EventRingLog:
+    """
+    固定容量的会话事件环形缓冲区
+
+    槽位在创建时一次性分配，写入时仅在分配序号和写槽位期间持锁；
+    事件字典在锁外构造。序号从 1 开始递增并写入事件的 "_seq" 字段，
+    迭代按序号从旧到新返回最近 capacity 条事件。
+    """
+
+    __slots__ = ("_buf", "_capacity", "_seq", "_lock")
+
+    def __init__(self, capacity: int = MAX_EVENT_LOG):
+        self._buf: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._capacity = capacity
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def seq(self) -> int:
+        """最近一次写入的序号（无事件时为 0）"""
+        return self._seq
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """写入事件并返回分配的序号"""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            event["_seq"] = seq
+            self._buf[(seq - 1) % self._capacity] = event
+        return seq
+
+    def _slot(self, seq: int) -> Dict[str, Any]:
+        # 序号 seq 位于最近 capacity 条之内时，其槽位必已写入
+        return cast(Dict[str, Any], self._buf[(seq - 1) % self._capacity])
+
+    def _snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            seq = self._seq
+            start = max(0, seq - self._capacity)
+            return [self._slot(s) for s in range(start + 1, seq + 1)]
+
+    def __len__(self) -> int:
+        return min(self._seq, self._capacity)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._snapshot())
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        if isinstance(index, slice):
+            return self._snapshot()[index]
+        with self._lock:
+            seq = self._seq
+            size = min(seq, self._capacity)
+            if index < 0:
+                index += size
+            if not 0 <= index < size:
+                raise IndexError("event log index out of range")
+            return self._slot(seq - size + index + 1)
+
+    def peek_first(self) -> Optional[Dict[str, Any]]:
+        """返回最旧的事件（无事件时为 None），不复制缓冲区"""
+        return self[0] if self._seq else None
+
+    def peek_last(self) -> Optional[Dict[str, Any]]:
+        """返回最新的事件（无事件时为 None），不复制缓冲区"""
+        with self._lock:
+            seq = self._seq
+            return self._slot(seq) if seq else None
+
+
+@dataclass(slots=True)
 class ResearchSession:
     """一次研究会话"""
     session_id: str
     orchestrator: ResearchOrchestrator
     history: AgentHistory
-    event_log: Deque[Dict[str, Any]] = field(
-        default_factory=lambda: deque(maxlen=MAX_EVENT_LOG)
-    )
-    event_seq: int = 0
+    event_log: EventRingLog = field(default_factory=EventRingLog)
     config: Dict[str, Any] = field(default_factory=dict)
     progress: int = 0
     current_stage: str = ""
     error: Optional[str] = None
     event_notifier: threading.Event = field(default_factory=threading.Event)
     event_lock: threading.Lock = field(default_factory=threading.Lock)
-    created_at: float = field(default_factory=time.time)
+    # 单调时钟读数，仅用于会话存活时长比较，不受系统时间调整影响；
+    # SessionManager 登记会话时在锁内重新打点，保证登记顺序即时间顺序
+    created_at: float = field(default_factory=time.monotonic)
+
+
+_created_at = operator.attrgetter("created_at")
 
 
 class SessionManager:
     """管理多个研究会话的创建/查询/列出"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        orchestrator_factory: Callable[..., ResearchOrchestrator] = ResearchOrchestrator,
+        history_factory: Callable[[], AgentHistory] = AgentHistory,
+    ):
+        # 会话依赖的构造入口，默认使用真实实现
+        self._orchestrator_factory = orchestrator_factory
+        self._history_factory = history_factory
+        # 会话表按写时复制维护：写者在锁内构造新字典并整体替换引用，
+        # 读者直接读取当前引用，无需加锁（字典一经发布便不再原地修改）。
         self._sessions: Dict[str, ResearchSession] = {}
-        self._lock = threading.RLock()
+        # 按创建顺序排列的会话元组（同样写时复制），created_at 单调不减，
+        # 清理时可按 created_at 二分定位过期前缀
+        self._by_ctime: Tuple[ResearchSession, ...] = ()
+        self._lock = threading.Lock()
 
     def create_session(self, config: Dict[str, Any]) -> ResearchSession:
         """
@@ -56,8 +159,8 @@ class SessionManager:
             创建的 ResearchSession
         """
         session_id = uuid.uuid4().hex[:12]
-        orchestrator = ResearchOrchestrator(output_dir="./output")
-        history = AgentHistory()
+        orchestrator = self._orchestrator_factory(output_dir="./output")
+        history = self._history_factory()
 
         session = ResearchSession(
             session_id=session_id,
@@ -73,35 +176,57 @@ class SessionManager:
         self._bind_events(session)
 
         with self._lock:
-            self._sessions[session_id] = session
+            session.created_at = time.monotonic()
+            self._sessions = {**self._sessions, session_id: session}
+            self._by_ctime = self._by_ctime + (session,)
 
         # 启动工作流（失败时回滚会话，避免泄漏僵尸 session）
         try:
             orchestrator.start_workflow(config)
         except Exception:
-            with self._lock:
-                self._sessions.pop(session_id, None)
+            self._remove([session_id])
             raise
 
         logger.info("创建会话: %s", session_id)
         return session
 
     def get_session(self, session_id: str) -> Optional[ResearchSession]:
-        with self._lock:
-            return self._sessions.get(session_id)
+        return self._sessions.get(session_id)
 
-    def delete_session(self, session_id: str, stop_if_running: bool = True) -> bool:
-        """删除会话并释放内存。"""
-        with self._lock:
-            session = self._sessions.pop(session_id, None)
-        if not session:
-            return False
+    def _remove(self, session_ids: List[str]) -> List[ResearchSession]:
+        """
+        从会话表批量移除并返回实际移除的会话。
 
+        会话表与创建顺序元组各只重建一次；并发调用时每个会话只会被
+        一个调用者拿到。
+        """
+        with self._lock:
+            current = self._sessions
+            removed = [current[sid] for sid in dict.fromkeys(session_ids) if sid in current]
+            if removed:
+                gone = {s.session_id for s in removed}
+                self._sessions = {sid: s for sid, s in current.items() if sid not in gone}
+                self._by_ctime = tuple(
+                    s for s in self._by_ctime if s.session_id not in gone
+                )
+        return removed
+
+    @staticmethod
+    def _release(session: ResearchSession, stop_if_running: bool) -> None:
+        """停止（可选）并唤醒已从会话表移除的会话"""
         if stop_if_running and session.orchestrator.is_running():
             session.orchestrator.stop_workflow()
 
         session.event_notifier.set()
-        logger.info("删除会话: %s", session_id)
+        logger.info("删除会话: %s", session.session_id)
+
+    def delete_session(self, session_id: str, stop_if_running: bool = True) -> bool:
+        """删除会话并释放内存。"""
+        removed = self._remove([session_id])
+        if not removed:
+            return False
+
+        self._release(removed[0], stop_if_running)
         return True
 
     def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -123,10 +248,8 @@ class SessionManager:
         }
 
     def list_sessions(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            items = list(self._sessions.items())
         results = []
-        for sid, session in items:
+        for sid, session in self._sessions.items():
             with session.event_lock:
                 progress = session.progress
             state = session.orchestrator.get_state()
@@ -139,31 +262,30 @@ class SessionManager:
 
     @property
     def active_count(self) -> int:
-        with self._lock:
-            sessions = list(self._sessions.values())
         return sum(
-            1 for s in sessions
-            if s.orchestrator.get_state() in (WorkflowState.RUNNING, WorkflowState.WAITING_CONFIRMATION)
+            1 for s in self._sessions.values()
+            if s.orchestrator.get_state() in ACTIVE_STATES
         )
 
     def cleanup_stale_sessions(self, max_age_seconds: float = 86400) -> int:
         """清理超过 max_age_seconds 的已完成/出错会话，返回清理数量"""
-        now = time.time()
-        to_remove = []
-        with self._lock:
-            items = list(self._sessions.items())
-        for sid, session in items:
-            age = now - session.created_at
-            if age < max_age_seconds:
-                continue
-            state = session.orchestrator.get_state()
-            if state in (WorkflowState.COMPLETED, WorkflowState.ERROR, WorkflowState.STOPPED):
-                to_remove.append(sid)
-        for sid in to_remove:
-            self.delete_session(sid, stop_if_running=False)
-        if to_remove:
-            logger.info("自动清理 %d 个过期会话", len(to_remove))
-        return len(to_remove)
+        cutoff = time.monotonic() - max_age_seconds
+        by_ctime = self._by_ctime
+        # 只遍历 created_at <= cutoff 的前缀，较新的会话无需检查
+        end = bisect.bisect_right(by_ctime, cutoff, key=_created_at)
+        stale = [
+            session.session_id for session in by_ctime[:end]
+            if session.orchestrator.get_state() in TERMINAL_STATES
+        ]
+        if not stale:
+            return 0
+
+        removed = self._remove(stale)
+        for session in removed:
+            self._release(session, stop_if_running=False)
+        if removed:
+            logger.info("自动清理 %d 个过期会话", len(removed))
+        return len(removed)
 
     def _register_agents(self, orchestrator: ResearchOrchestrator) -> None:
         """注册所有 Agent（无 Qt 依赖版本）"""
@@ -201,45 +323,55 @@ class SessionManager:
         supervisor.api_config = config_manager.get_agent_by_type("supervisor") or fallback_config
         orchestrator.set_supervisor(supervisor)
 
+    # orchestrator 事件类型 -> 处理方法名（类级常量，绑定时按表注册）
+    _EVENT_HANDLERS: Dict[str, str] = {
+        "progress_updated": "_handle_progress",
+        "log_message": "_handle_log",
+        "workflow_error": "_handle_error",
+        "workflow_completed": "_handle_completed",
+    }
+
     def _bind_events(self, session: ResearchSession) -> None:
         """订阅 orchestrator 事件并存入 event_log"""
-        orch = session.orchestrator
-        
-        def append_event(
-            event: Dict[str, Any], update: Optional[Callable[[], None]] = None
-        ) -> None:
-            with session.event_lock:
-                if update:
-                    update()
-                session.event_seq += 1
-                payload = dict(event)
-                payload["_seq"] = session.event_seq
-                session.event_log.append(payload)
-            session.event_notifier.set()
-
-        def on_progress(event):
-            data = event.data if isinstance(event.data, dict) else {"raw": event.data}
-
-            def update_progress() -> None:
-                raw_progress = data.get("progress", 0)
-                session.progress = int(raw_progress) if isinstance(raw_progress, (int, float)) else 0
-                session.current_stage = str(data.get("description", ""))
-
-            append_event({"type": "progress", "data": data}, update=update_progress)
-
-        def on_log(event):
-            append_event({"type": "log", "data": event.data})
-
-        def on_error(event):
-            append_event(
-                {"type": "error", "data": event.data},
-                update=lambda: setattr(session, "error", str(event.data)),
-            )
-
-        def on_completed(event):
-            append_event({"type": "completed"}, update=lambda: setattr(session, "progress", 100))
-
-        orch.events.on("progress_updated", on_progress)
-        orch.events.on("log_message", on_log)
-        orch.events.on("workflow_error", on_error)
-        orch.events.on("workflow_completed", on_completed)
+        events = session.orchestrator.events
+        for event_type, method_name in self._EVENT_HANDLERS.items():
+            events.on(event_type, functools.partial(getattr(self, method_name), session))
+
+    @staticmethod
+    def _append_event(
+        session: ResearchSession,
+        event: Dict[str, Any],
+        update: Optional[Callable[[], None]] = None,
+    ) -> None:
+        # 字段更新与事件写入在同一临界区内完成，读者不会先看到状态变化、
+        # 后看到对应事件
+        with session.event_lock:
+            if update:
+                update()
+            session.event_log.append(event)
+        session.event_notifier.set()
+
+    def _handle_progress(self, session: ResearchSession, event: Event) -> None:
+        data = event.data if isinstance(event.data, dict) else {"raw": event.data}
+
+        def update_progress() -> None:
+            raw_progress = data.get("progress", 0)
+            session.progress = int(raw_progress) if isinstance(raw_progress, (int, float)) else 0
+            session.current_stage = str(data.get("description", ""))
+
+        self._append_event(session, {"type": "progress", "data": data}, update=update_progress)
+
+    def _handle_log(self, session: ResearchSession, event: Event) -> None:
+        self._append_event(session, {"type": "log", "data": event.data})
+
+    def _handle_error(self, session: ResearchSession, event: Event) -> None:
+        self._append_event(
+            session,
+            {"type": "error", "data": event.data},
+            update=lambda: setattr(session, "error", str(event.data)),
+        )
+
+    def _handle_completed(self, session: ResearchSession, event: Event) -> None:
+        self._append_event(
+            session, {"type": "completed"}, update=lambda: setattr(session, "progress", 100)
+        )
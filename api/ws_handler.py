@@ -3,14 +3,37 @@
 WebSocket connection manager for API sessions.
 """
 
+import asyncio
 import logging
 import threading
-from typing import Dict, List
+from typing import Any, Dict, List, Union
 
 from fastapi import WebSocket
 
+from core.events import Event, encode_json
+
 logger = logging.getLogger(__name__)
 
+# Sockets sent to per gather() round before yielding back to the event loop.
+BROADCAST_BATCH_SIZE = 50
+
+
+def encode_message(message: Any) -> str:
+    """Serialize a message once in the compact form Starlette's send_json uses.
+
+    Shares core.events.encode_json with Event.as_json_bytes, so dict messages
+    and events are encoded with the same options and fallbacks.
+    """
+    return encode_json(message).decode("utf-8")
+
+
+async def _send_encoded(ws: WebSocket, text: str, message: Any) -> None:
+    send_text = getattr(ws, "send_text", None)
+    if send_text is not None:
+        await send_text(text)
+    else:
+        await ws.send_json(message)
+
 
 class ConnectionManager:
     """Manage WebSocket connections grouped by session_id."""
@@ -38,19 +61,36 @@ class ConnectionManager:
                     del self._connections[session_id]
         logger.info("WebSocket disconnected: session=%s", session_id)
 
-    async def broadcast(self, session_id: str, message: dict) -> None:
-        """Broadcast one message to all active sockets in a session."""
+    async def broadcast(self, session_id: str, message: Union[dict, Event]) -> None:
+        """Broadcast one message to all active sockets in a session.
+
+        The message is serialized once and sent to all sockets concurrently,
+        in batches of BROADCAST_BATCH_SIZE. An Event reuses its cached JSON
+        encoding, so broadcasting it to several sessions encodes it only once.
+
+        The /ws endpoint in api/routes.py replays each socket's own event-log
+        cursor and does not go through this method.
+        """
         with self._lock:
             targets = list(self._connections.get(session_id, []))
         if not targets:
             return
 
-        dead = []
-        for ws in targets:
-            try:
-                await ws.send_json(message)
-            except Exception:
-                dead.append(ws)
+        if isinstance(message, Event):
+            text = message.as_json_bytes.decode("utf-8")
+            message = message.to_dict()
+        else:
+            text = encode_message(message)
+        dead: List[WebSocket] = []
+        for i in range(0, len(targets), BROADCAST_BATCH_SIZE):
+            if i:
+                await asyncio.sleep(0)
+            batch = targets[i:i + BROADCAST_BATCH_SIZE]
+            results = await asyncio.gather(
+                *(_send_encoded(ws, text, message) for ws in batch),
+                return_exceptions=True,
+            )
+            dead.extend(ws for ws, result in zip(batch, results) if isinstance(result, Exception))
 
         if not dead:
             return
@@ -8,7 +8,7 @@ import getpass
 import hashlib
 import json
 import dataclasses
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -16,10 +16,34 @@ from cryptography.fernet import Fernet
 
 from logger_config import get_logger
 
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
 logger = get_logger(__name__)
 
 
-@dataclass
+def _dump_json_bytes(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _load_json_bytes(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# 列表型字段的默认值（共享的不可变元组，每个实例按需复制为列表）
+_DEFAULT_RAG_PATHS = ("./README.md", "./docs", "./prompts/control_systems")
+_DEFAULT_RAG_GLOBS = ("*.md", "*.txt", "*.rst", "*.yaml", "*.yml", "*.tex", "*.json", "*.py")
+_DEFAULT_SKILL_PATHS = ("./skills",)
+_DEFAULT_SKILL_GLOBS = ("*.md", "*.txt", "*.rst", "*.yaml", "*.yml")
+
+
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     agent_type: str
     provider_name: str
@@ -35,36 +59,54 @@ class AgentConfig:
     rag_chunk_overlap: int = 200
     rag_max_context_chars: int = 5000
     rag_max_file_size_kb: int = 512
-    rag_paths: List[str] = field(
-        default_factory=lambda: ["./README.md", "./docs", "./prompts/control_systems"]
-    )
-    rag_include_globs: List[str] = field(
-        default_factory=lambda: ["*.md", "*.txt", "*.rst", "*.yaml", "*.yml", "*.tex", "*.json", "*.py"]
-    )
+    rag_paths: List[str] = field(default_factory=lambda: list(_DEFAULT_RAG_PATHS))
+    rag_include_globs: List[str] = field(default_factory=lambda: list(_DEFAULT_RAG_GLOBS))
     skill_enabled: bool = True
     skill_max_context_chars: int = 4000
     skill_max_files: int = 8
     skill_max_file_size_kb: int = 256
-    skill_paths: List[str] = field(default_factory=lambda: ["./skills"])
-    skill_include_globs: List[str] = field(
-        default_factory=lambda: ["*.md", "*.txt", "*.rst", "*.yaml", "*.yml"]
+    skill_paths: List[str] = field(default_factory=lambda: list(_DEFAULT_SKILL_PATHS))
+    skill_include_globs: List[str] = field(default_factory=lambda: list(_DEFAULT_SKILL_GLOBS))
+    _masked_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
     )
 
     def to_dict(self, mask_api_key: bool = True) -> Dict[str, Any]:
-        data = asdict(self)
-        if mask_api_key and self.api_key:
-            data["api_key"] = f"***{self.api_key[-3:]}" if len(self.api_key) >= 3 else "***"
+        # The masked form is what logs/UI ask for repeatedly; build it once.
+        if not mask_api_key:
+            return self._build_dict()
+        cached = self._masked_dict
+        if cached is None:
+            cached = self._build_dict()
+            if self.api_key:
+                cached["api_key"] = f"***{self.api_key[-3:]}" if len(self.api_key) >= 3 else "***"
+            object.__setattr__(self, "_masked_dict", cached)
+        # frozen 不冻结列表字段：列表值每次按当前字段重新复制，不与缓存共享
+        data = dict(cached)
+        for name in _AGENT_CONFIG_LIST_FIELDS:
+            data[name] = list(getattr(self, name))
+        return data
+
+    def _build_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        for name in _AGENT_CONFIG_FIELDS:
+            value = getattr(self, name)
+            data[name] = list(value) if isinstance(value, list) else value
         return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AgentConfig":
         # Only pass keys that are valid dataclass fields, letting defaults handle the rest
-        valid_fields = {f.name for f in dataclasses.fields(cls)}
-        filtered = {k: v for k, v in data.items() if k in valid_fields}
+        filtered = {k: v for k, v in data.items() if k in _AGENT_CONFIG_FIELD_SET}
         return cls(**filtered)
 
 
-@dataclass
+_AGENT_CONFIG_FIELDS = tuple(f.name for f in dataclasses.fields(AgentConfig) if f.init)
+_AGENT_CONFIG_FIELD_SET = frozenset(_AGENT_CONFIG_FIELDS)
+_AGENT_CONFIG_LIST_FIELDS = ("rag_paths", "rag_include_globs", "skill_paths", "skill_include_globs")
+
+
+@dataclass(slots=True)
 class AppSettings:
     agents: List[AgentConfig] = field(default_factory=list)
     matlab_path: str = ""
@@ -142,8 +184,7 @@ class ConfigManager:
             return True
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _load_json_bytes(self.config_path.read_bytes())
             for agent_data in data.get("agents", []):
                 if "api_key" in agent_data:
                     agent_data["api_key"] = self._decrypt_api_key(agent_data["api_key"])
@@ -162,8 +203,7 @@ class ConfigManager:
                     agent_data["api_key"] = self._encrypt_api_key(agent_data["api_key"])
 
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.config_path.write_bytes(_dump_json_bytes(data))
             return True
         except Exception as e:
             logger.error("Failed to save config: %s", e)
@@ -9,17 +9,41 @@
 """
 
 import asyncio
+import json
+import queue
 import threading
+import time
 from collections import deque
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from logger_config import get_logger
 
+try:
+    import orjson  # type: ignore[import-not-found, unused-ignore]
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore[assignment, unused-ignore]
+
 logger = get_logger(__name__)
 
 
+def encode_json(obj: Any) -> bytes:
+    """
+    紧凑 UTF-8 JSON 编码（事件与 WebSocket 消息共用）
+
+    非字符串键按标准库规则转为字符串，无法序列化的值转为 str；
+    orjson 不支持的值（如超过 64 位的整数）回退到标准库编码。
+    orjson 路径下 NaN/Infinity 编码为 null。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
 class EventType(Enum):
     """预定义事件类型"""
     PROGRESS_UPDATED = "progress_updated"
@@ -33,13 +57,42 @@ class EventType(Enum):
     WORKFLOW_STOPPED = "workflow_stopped"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """事件数据类"""
     type: str
     data: Any = None
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     source: str = ""
+    # 首次序列化后缓存的 JSON 字节串，供多个连接重复发送
+    _json_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def timestamp(self) -> float:
+        """事件时间（Unix 时间戳，秒）"""
+        return self.timestamp_ns / 1e9
+
+    @property
+    def iso_timestamp(self) -> str:
+        """事件时间（本地时区 ISO 8601 字符串，按需格式化）"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9).isoformat()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的消息字典"""
+        return {
+            "type": self.type,
+            "data": self.data,
+            "timestamp": self.timestamp,
+            "source": self.source,
+        }
+
+    @property
+    def as_json_bytes(self) -> bytes:
+        """事件的 UTF-8 JSON 编码（首次访问时序列化并缓存，无法序列化的值转为字符串）"""
+        cached = self._json_cache
+        if cached is None:
+            cached = self._json_cache = encode_json(self.to_dict())
+        return cached
 
 
 class EventEmitter:
@@ -60,11 +113,15 @@ class EventEmitter:
     """
 
     def __init__(self, max_history: int = 100):
-        self._listeners: Dict[str, List[Callable]] = {}
-        self._async_listeners: Dict[str, List[Callable]] = {}
+        # 监听器表写时复制：写者在锁内构造新字典（值为不可变元组）并整体替换引用，
+        # emit 直接读取当前引用，看到的要么是旧表要么是新表，无需加锁
+        self._listeners: Dict[str, Tuple[Callable, ...]] = {}
+        self._async_listeners: Dict[str, Tuple[Callable, ...]] = {}
         self._lock = threading.RLock()
         self._max_history = max_history
+        # 全局历史 + 按类型分区的历史；写入与快照都在锁内进行，避免迭代时被并发修改
         self._event_history: deque[Event] = deque(maxlen=max_history)
+        self._history_by_type: Dict[str, deque[Event]] = {}
 
     def on(self, event_type: str, callback: Callable) -> 'EventEmitter':
         """
@@ -78,11 +135,11 @@ class EventEmitter:
             self，支持链式调用
         """
         with self._lock:
-            if event_type not in self._listeners:
-                self._listeners[event_type] = []
+            listeners = self._listeners
+            current = listeners.get(event_type, ())
             # 避免重复注册同一个回调
-            if callback not in self._listeners[event_type]:
-                self._listeners[event_type].append(callback)
+            if callback not in current:
+                self._listeners = {**listeners, event_type: current + (callback,)}
         return self
 
     def on_async(self, event_type: str, callback: Callable) -> 'EventEmitter':
@@ -97,11 +154,11 @@ class EventEmitter:
             self，支持链式调用
         """
         with self._lock:
-            if event_type not in self._async_listeners:
-                self._async_listeners[event_type] = []
+            listeners = self._async_listeners
+            current = listeners.get(event_type, ())
             # 避免重复注册同一个回调
-            if callback not in self._async_listeners[event_type]:
-                self._async_listeners[event_type].append(callback)
+            if callback not in current:
+                self._async_listeners = {**listeners, event_type: current + (callback,)}
         return self
 
     def off(self, event_type: str, callback: Callable = None) -> 'EventEmitter':
@@ -116,20 +173,36 @@ class EventEmitter:
             self
         """
         with self._lock:
-            if callback is None:
-                self._listeners.pop(event_type, None)
-                self._async_listeners.pop(event_type, None)
-            else:
-                if event_type in self._listeners:
-                    self._listeners[event_type] = [
-                        cb for cb in self._listeners[event_type] if cb != callback
-                    ]
-                if event_type in self._async_listeners:
-                    self._async_listeners[event_type] = [
-                        cb for cb in self._async_listeners[event_type] if cb != callback
-                    ]
+            self._listeners = self._without(self._listeners, event_type, callback)
+            self._async_listeners = self._without(self._async_listeners, event_type, callback)
         return self
 
+    @staticmethod
+    def _without(
+        listeners: Dict[str, Tuple[Callable, ...]],
+        event_type: str,
+        callback: Optional[Callable],
+    ) -> Dict[str, Tuple[Callable, ...]]:
+        """返回移除指定回调（callback 为 None 时移除该类型全部回调）后的新监听器表"""
+        if event_type not in listeners:
+            return listeners
+        remaining = () if callback is None else tuple(
+            cb for cb in listeners[event_type] if cb != callback
+        )
+        if remaining:
+            return {**listeners, event_type: remaining}
+        # 不保留空条目：表中只有仍有订阅者的事件类型
+        return {k: v for k, v in listeners.items() if k != event_type}
+
+    def _record(self, event: Event) -> None:
+        """记录历史 (deque auto-evicts oldest when maxlen exceeded)"""
+        with self._lock:
+            self._event_history.append(event)
+            typed = self._history_by_type.get(event.type)
+            if typed is None:
+                typed = self._history_by_type[event.type] = deque(maxlen=self._max_history)
+            typed.append(event)
+
     def emit(self, event_type: str, data: Any = None, source: str = "") -> Event:
         """
         发射事件（同步）
@@ -144,15 +217,10 @@ class EventEmitter:
         """
         event = Event(type=event_type, data=data, source=source)
 
-        with self._lock:
-            # 记录历史 (deque auto-evicts oldest when maxlen exceeded)
-            self._event_history.append(event)
+        self._record(event)
 
-            # 获取监听器副本
-            listeners = list(self._listeners.get(event_type, []))
-
-        # 在锁外执行回调
-        for callback in listeners:
+        # 监听器表按引用整体替换，直接读取当前快照并在锁外执行回调
+        for callback in self._listeners.get(event_type, ()):
             try:
                 callback(event)
             except Exception as e:
@@ -164,6 +232,11 @@ class EventEmitter:
         """
         发射事件（异步）
 
+        同步监听器按注册顺序先执行。异步监听器中的普通函数在调度阶段
+        即被调用，因此早于所有协程回调；协程回调随后并发执行，彼此之间
+        不再保证注册顺序。单个协程回调抛出的 Exception 只记录日志；
+        CancelledError 等 BaseException 在其余回调结束后重新抛出。
+
         Args:
             event_type: 事件类型
             data: 事件数据
@@ -174,11 +247,10 @@ class EventEmitter:
         """
         event = Event(type=event_type, data=data, source=source)
 
-        with self._lock:
-            self._event_history.append(event)
+        self._record(event)
 
-            sync_listeners = list(self._listeners.get(event_type, []))
-            async_listeners = list(self._async_listeners.get(event_type, []))
+        sync_listeners = self._listeners.get(event_type, ())
+        async_listeners = self._async_listeners.get(event_type, ())
 
         # 执行同步回调
         for callback in sync_listeners:
@@ -187,16 +259,28 @@ class EventEmitter:
             except Exception as e:
                 logger.error("同步回调错误: %s", e)
 
-        # 执行异步回调
+        # 执行异步回调：协程回调并发调度，任一失败不影响其余回调
+        coroutines = []
         for callback in async_listeners:
             try:
                 if asyncio.iscoroutinefunction(callback):
-                    await callback(event)
+                    coroutines.append(callback(event))
                 else:
                     callback(event)
             except Exception as e:
                 logger.error("异步回调错误: %s", e)
 
+        if coroutines:
+            results = await asyncio.gather(*coroutines, return_exceptions=True)
+            fatal: Optional[BaseException] = None
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("异步回调错误: %s", result)
+                elif isinstance(result, BaseException) and fatal is None:
+                    fatal = result
+            if fatal is not None:
+                raise fatal
+
         return event
 
     def once(self, event_type: str, callback: Callable) -> 'EventEmitter':
@@ -219,10 +303,29 @@ class EventEmitter:
     def clear(self) -> 'EventEmitter':
         """清除所有监听器"""
         with self._lock:
-            self._listeners.clear()
-            self._async_listeners.clear()
+            self._listeners = {}
+            self._async_listeners = {}
         return self
 
+    @classmethod
+    def acquire(cls) -> 'EventEmitter':
+        """从对象池取出一个空闲的发射器（池为空时新建）"""
+        try:
+            return _EMITTER_POOL.get_nowait()
+        except queue.Empty:
+            return cls()
+
+    def release(self) -> None:
+        """清空监听器与历史后归还对象池（池已满时直接丢弃）"""
+        self.clear()
+        with self._lock:
+            self._event_history.clear()
+            self._history_by_type.clear()
+        try:
+            _EMITTER_POOL.put_nowait(self)
+        except queue.Full:
+            pass
+
     def get_history(self, event_type: str = None, limit: int = 10) -> List[Event]:
         """
         获取事件历史
@@ -235,20 +338,23 @@ class EventEmitter:
             事件列表（最近的在末尾）
         """
         with self._lock:
-            if event_type:
-                events = [e for e in self._event_history if e.type == event_type]
-            else:
-                events = list(self._event_history)
+            history = self._history_by_type.get(event_type, ()) if event_type else self._event_history
+            events = list(history)
         return events[-limit:] if limit < len(events) else events
 
     def listener_count(self, event_type: str = None) -> int:
         """获取监听器数量"""
-        with self._lock:
-            if event_type:
-                return (len(self._listeners.get(event_type, [])) +
-                        len(self._async_listeners.get(event_type, [])))
-            return sum(len(v) for v in self._listeners.values()) + \
-                   sum(len(v) for v in self._async_listeners.values())
+        # 读取当前监听器表快照即可，无需加锁
+        listeners, async_listeners = self._listeners, self._async_listeners
+        if event_type:
+            return (len(listeners.get(event_type, ())) +
+                    len(async_listeners.get(event_type, ())))
+        return sum(len(v) for v in listeners.values()) + \
+               sum(len(v) for v in async_listeners.values())
+
+
+# 可复用的默认配置发射器，供 EventEmitter.acquire/release 使用
+_EMITTER_POOL: "queue.LifoQueue[EventEmitter]" = queue.LifoQueue(maxsize=64)
 
 
 # 便捷函数：创建预配置的事件发射器
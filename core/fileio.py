@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+File scanning and reading helpers shared by the local RAG and skill loaders.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+import os
+import re
+from pathlib import Path
+from typing import FrozenSet, Iterable, Optional, Pattern, Sequence, Tuple
+
+_READ_BUFFER_SIZE = 1 << 16
+
+
+@functools.lru_cache(maxsize=64)
+def compile_globs(include_globs: Tuple[str, ...]) -> Tuple[Pattern[str], ...]:
+    """Compile filename globs once per distinct tuple.
+
+    Matching follows the platform's filename case rules, like glob does.
+    """
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return tuple(re.compile(fnmatch.translate(g), flags) for g in include_globs)
+
+
+def walk_matching(
+    base: str,
+    include_res: Sequence[Pattern[str]],
+    excluded_names: FrozenSet[str] = frozenset(),
+) -> Iterable[Tuple[str, os.DirEntry]]:
+    """Yield (path, entry) for files under ``base`` whose names match a glob.
+
+    Uses os.scandir so file type and stat come from the cached DirEntry;
+    entries named in ``excluded_names`` (lowercased) are pruned instead of
+    walked. Directory symlinks are not followed.
+    """
+    stack = [base]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            name = entry.name
+            if excluded_names and name.lower() in excluded_names:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif any(pattern.match(name) for pattern in include_res) and entry.is_file():
+                    yield entry.path, entry
+            except OSError:
+                continue
+
+
+def safe_read_text(path: Path, size: int, max_file_size_kb: int) -> Optional[str]:
+    """Read a file whose ``size`` is already known from the directory scan.
+
+    Oversized files are rejected before opening. Accepted files are read as
+    bytes and decoded once, bypassing the TextIOWrapper layer; line endings
+    are normalized the same way text mode would.
+    """
+    if size > max_file_size_kb * 1024:
+        return None
+    try:
+        with open(path, "rb", buffering=_READ_BUFFER_SIZE) as fh:
+            raw = fh.read()
+    except OSError:
+        return None
+    text = raw.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
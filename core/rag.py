@@ -6,21 +6,29 @@ Design goals:
 - No third-party retrieval dependencies.
 - Works with local project files (docs/prompts/readme).
 - Cached in-memory index with cheap staleness checks.
+- Scoring is a sparse matrix-vector product over NumPy arrays.
 """
 
 from __future__ import annotations
 
+import functools
 import math
 import os
 import re
+import stat
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Lock
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+import numpy as np
 
 from logger_config import get_logger
 
+from .fileio import compile_globs, safe_read_text, walk_matching
+
 logger = get_logger(__name__)
 
 DEFAULT_INCLUDE_GLOBS: Tuple[str, ...] = (
@@ -44,6 +52,14 @@ DEFAULT_EXCLUDE_PARTS: Tuple[str, ...] = (
     "autocontrol_scientist.egg-info",
 )
 
+# Upper bound on threads used to read/chunk files during an index rebuild.
+_MAX_LOAD_WORKERS = 8
+# Distinct knowledge bases (sources x chunking) whose latest built index is
+# kept for sharing between engines; older ones are rebuilt on demand.
+_MAX_SHARED_CORPORA = 8
+# Candidate pool per requested result before diversification widens it.
+_CANDIDATE_FANOUT = 4
+
 
 @dataclass(frozen=True)
 class RAGSettings:
@@ -68,13 +84,111 @@ class ChunkRecord:
     path: str
     chunk_id: int
     text: str
-    tf: Counter
-    norm: float
+
+
+@dataclass(frozen=True)
+class _FileTerms:
+    """Term frequencies of one file's chunks, stored as flat arrays.
+
+    Chunk ``i``'s distinct terms are ``terms[offsets[i]:offsets[i + 1]]``
+    with matching ``counts``; ``norms[i]`` is the L2 norm of its raw counts.
+    """
+
+    chunks: Tuple[ChunkRecord, ...]
+    terms: Tuple[str, ...]
+    counts: np.ndarray
+    offsets: np.ndarray
+    norms: np.ndarray
+
+
+_NO_TERMS = _FileTerms(
+    chunks=(),
+    terms=(),
+    counts=np.zeros(0, dtype=np.int32),
+    offsets=np.zeros(1, dtype=np.int64),
+    norms=np.zeros(0, dtype=np.float64),
+)
+
+
+@dataclass(frozen=True)
+class _TermIndex:
+    """Term-major sparse TF-IDF matrix (CSR layout of the term x chunk matrix).
+
+    Postings of term ``vocab[t]`` are ``rows[indptr[t]:indptr[t + 1]]`` with
+    weights ``tf * idf / norm``, so a chunk's score is a sum over the
+    query terms' postings only.
+    """
+
+    vocab: Dict[str, int]
+    indptr: np.ndarray
+    rows: np.ndarray
+    weights: np.ndarray
+
+
+@dataclass(frozen=True)
+class _Corpus:
+    """One built index: chunks, IDF table and term index, published together."""
+
+    chunks: Tuple[ChunkRecord, ...]
+    idf: Dict[str, float]
+    index: _TermIndex
+
+
+def _build_term_index(files: Sequence[_FileTerms], idf: Dict[str, float]) -> _TermIndex:
+    vocab = {token: col for col, token in enumerate(idf)}
+    idf_arr = np.fromiter(idf.values(), dtype=np.float64, count=len(idf))
+    nnz = sum(len(f.terms) for f in files)
+    cols = np.fromiter(
+        (vocab[token] for f in files for token in f.terms), dtype=np.int64, count=nnz
+    )
+    counts = np.concatenate([f.counts for f in files] or [_NO_TERMS.counts])
+    norms = np.concatenate([f.norms for f in files] or [_NO_TERMS.norms])
+    lengths = np.concatenate([np.diff(f.offsets) for f in files] or [_NO_TERMS.counts])
+    rows = np.repeat(np.arange(len(norms), dtype=np.int32), lengths)
+
+    order = np.argsort(cols, kind="stable")
+    indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cols, minlength=len(vocab)), out=indptr[1:])
+    weights = counts * idf_arr[cols] / norms[rows]
+    return _TermIndex(
+        vocab=vocab,
+        indptr=indptr,
+        rows=rows[order],
+        weights=weights[order].astype(np.float32),
+    )
+
+
+def _ranked_rows(scores: np.ndarray, hit_rows: np.ndarray, pool_size: int) -> Iterator[int]:
+    """Yield ``hit_rows`` by descending score, ties by ascending row.
+
+    Only a candidate pool of the best ``pool_size`` rows (plus any rows tied
+    with the last one) is sorted; the pool grows geometrically if the caller
+    keeps consuming, e.g. when per-file diversification rejects candidates.
+    Each larger pool's order extends the previous one, so the sequence is
+    identical to a full stable sort.
+    """
+    hit_scores = scores[hit_rows]
+    total = len(hit_rows)
+    emitted = 0
+    while emitted < total:
+        if pool_size >= total:
+            pool = hit_rows
+        else:
+            kth = np.partition(hit_scores, total - pool_size)[total - pool_size]
+            pool = hit_rows[hit_scores >= kth]
+        order = pool[np.argsort(-scores[pool], kind="stable")]
+        yield from order[emitted:].tolist()
+        emitted = len(order)
+        pool_size *= _CANDIDATE_FANOUT
+
+
+# Keep ASCII words + digits + contiguous CJK spans for mixed-language queries.
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+|[\u4e00-\u9fff]+")
+_find_tokens = _TOKEN_RE.findall
 
 
 def _tokenize(text: str) -> List[str]:
-    # Keep ASCII words + digits + contiguous CJK spans for mixed-language queries.
-    return re.findall(r"[A-Za-z0-9_]+|[\u4e00-\u9fff]+", text.lower())
+    return _find_tokens(text.lower())
 
 
 def _split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
@@ -95,13 +209,47 @@ def _split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
     return chunks
 
 
-def _safe_read_text(path: Path, max_file_size_kb: int) -> Optional[str]:
-    try:
-        if path.stat().st_size > max_file_size_kb * 1024:
-            return None
-        return path.read_text(encoding="utf-8", errors="ignore")
-    except OSError:
-        return None
+@functools.lru_cache(maxsize=512)
+def _load_and_chunk(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    chunk_size: int,
+    chunk_overlap: int,
+    max_file_size_kb: int,
+) -> _FileTerms:
+    """Read, split and tokenize one file.
+
+    ``mtime_ns`` and ``size`` are only part of the cache key: an edited file
+    gets a new key, so unchanged files are never re-read or re-tokenized.
+    """
+    text = safe_read_text(Path(path), size, max_file_size_kb)
+    if not text:
+        return _NO_TERMS
+    chunks: List[ChunkRecord] = []
+    terms: List[str] = []
+    counts: List[int] = []
+    offsets: List[int] = [0]
+    norms: List[float] = []
+    for idx, part in enumerate(_split_text(text, chunk_size, chunk_overlap)):
+        tokens = _tokenize(part)
+        if not tokens:
+            continue
+        tf = Counter(tokens)
+        chunks.append(ChunkRecord(path=path, chunk_id=idx, text=part))
+        terms.extend(tf.keys())
+        counts.extend(tf.values())
+        offsets.append(len(terms))
+        norms.append(math.sqrt(sum(v * v for v in tf.values())) or 1.0)
+    if not chunks:
+        return _NO_TERMS
+    return _FileTerms(
+        chunks=tuple(chunks),
+        terms=tuple(terms),
+        counts=np.asarray(counts, dtype=np.int32),
+        offsets=np.asarray(offsets, dtype=np.int64),
+        norms=np.asarray(norms, dtype=np.float64),
+    )
 
 
 def _is_excluded(path: Path) -> bool:
@@ -109,96 +257,174 @@ def _is_excluded(path: Path) -> bool:
     return any(part in lowered_parts for part in DEFAULT_EXCLUDE_PARTS)
 
 
-def _collect_files(source_paths: Sequence[str], include_globs: Sequence[str]) -> List[Path]:
-    files: List[Path] = []
+_EXCLUDED_NAMES = frozenset(DEFAULT_EXCLUDE_PARTS)
+
+
+def _collect_files(
+    source_paths: Sequence[str], include_res: Sequence[Pattern[str]]
+) -> List[Tuple[Path, os.stat_result]]:
+    """Return (resolved path, stat) for every indexable file, sorted by path."""
+    files: List[Tuple[Path, os.stat_result]] = []
     seen: set[str] = set()
     for raw in source_paths:
         p = Path(raw).resolve()
-        if not p.exists():
+        if _is_excluded(p):
             continue
-        if p.is_file():
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if not stat.S_ISDIR(st.st_mode):
             key = str(p)
-            if key not in seen and not _is_excluded(p):
-                files.append(p)
+            if key not in seen:
+                files.append((p, st))
                 seen.add(key)
             continue
-        for pattern in include_globs:
-            for file in p.rglob(pattern):
-                if not file.is_file() or _is_excluded(file):
-                    continue
-                key = str(file.resolve())
-                if key in seen:
-                    continue
-                files.append(file.resolve())
-                seen.add(key)
+        for path, entry in walk_matching(str(p), include_res, _EXCLUDED_NAMES):
+            try:
+                if entry.is_symlink():
+                    file = Path(path).resolve()
+                    file_st = file.stat()
+                else:
+                    file = Path(path)
+                    file_st = entry.stat()
+            except OSError:
+                continue
+            key = str(file)
+            if key in seen:
+                continue
+            files.append((file, file_st))
+            seen.add(key)
+    files.sort(key=lambda item: item[0])
     return files
 
 
+def _signature_of(files: Sequence[Tuple[Path, os.stat_result]]) -> Tuple[Tuple[str, int, int], ...]:
+    return tuple((str(path), st.st_mtime_ns, st.st_size) for path, st in files)
+
+
+def _build_corpus(
+    jobs: Tuple[Tuple[str, int, int], ...],
+    chunk_size: int,
+    chunk_overlap: int,
+    max_file_size_kb: int,
+) -> _Corpus:
+    """Build chunks, IDF table and term index for one set of file versions.
+
+    ``jobs`` holds ``(path, mtime_ns, size)`` per file.
+    """
+
+    def load(job: Tuple[str, int, int]) -> _FileTerms:
+        return _load_and_chunk(*job, chunk_size, chunk_overlap, max_file_size_kb)
+
+    # Reads are I/O-bound and independent, so overlap them across files.
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAX_LOAD_WORKERS, len(jobs))) as pool:
+            per_file = list(pool.map(load, jobs))
+    else:
+        per_file = [load(job) for job in jobs]
+
+    chunks: List[ChunkRecord] = []
+    df: Counter = Counter()
+    for file_terms in per_file:
+        chunks.extend(file_terms.chunks)
+        # Terms are distinct within a chunk, so occurrences == document frequency.
+        df.update(file_terms.terms)
+
+    total = max(1, len(chunks))
+    idf: Dict[str, float] = {}
+    for token, count in df.items():
+        idf[token] = math.log((1 + total) / (1 + count)) + 1.0
+
+    logger.info("RAG index rebuilt: files=%d chunks=%d", len(jobs), len(chunks))
+    return _Corpus(chunks=tuple(chunks), idf=idf, index=_build_term_index(per_file, idf))
+
+
+# Knowledge-base key -> (file versions, corpus). Only the latest version of
+# each knowledge base is kept: an edit replaces the entry instead of pinning
+# another full copy of the index next to the old one.
+_CORPUS_CACHE: Dict[Tuple[object, ...], Tuple[Tuple[Tuple[str, int, int], ...], _Corpus]] = {}
+_CORPUS_LOCK = Lock()
+
+
+def _shared_corpus(
+    kb_key: Tuple[object, ...],
+    jobs: Tuple[Tuple[str, int, int], ...],
+    chunk_size: int,
+    chunk_overlap: int,
+    max_file_size_kb: int,
+) -> _Corpus:
+    """Return the corpus for ``jobs``, shared by every engine on ``kb_key``.
+
+    Engines whose settings differ only in retrieval knobs (top_k, min_score,
+    ...) get the same ``kb_key`` and therefore one index instead of each
+    building and holding its own copy. The result is read-only.
+    """
+    with _CORPUS_LOCK:
+        cached = _CORPUS_CACHE.get(kb_key)
+        if cached is not None and cached[0] == jobs:
+            return cached[1]
+    # Built outside the lock so engines on other knowledge bases are not blocked.
+    corpus = _build_corpus(jobs, chunk_size, chunk_overlap, max_file_size_kb)
+    with _CORPUS_LOCK:
+        _CORPUS_CACHE.pop(kb_key, None)
+        _CORPUS_CACHE[kb_key] = (jobs, corpus)
+        while len(_CORPUS_CACHE) > _MAX_SHARED_CORPORA:
+            del _CORPUS_CACHE[next(iter(_CORPUS_CACHE))]
+    return corpus
+
+
 class LocalRAGEngine:
     def __init__(self, settings: RAGSettings):
         self.settings = settings
-        self._idf: Dict[str, float] = {}
-        self._chunks: List[ChunkRecord] = []
-        self._signature: Optional[Tuple[Tuple[str, float], ...]] = None
+        self._include_res = compile_globs(tuple(settings.include_globs))
+        # Replaced as a whole on rebuild, so readers never mix old and new parts.
+        self._corpus: Optional[_Corpus] = None
+        self._signature: Optional[Tuple[Tuple[str, int, int], ...]] = None
         self._lock = Lock()
 
-    def _current_signature(self) -> Tuple[Tuple[str, float], ...]:
-        signature: List[Tuple[str, float]] = []
-        files = _collect_files(self.settings.source_paths, self.settings.include_globs)
-        for file in files:
-            try:
-                signature.append((str(file), file.stat().st_mtime))
-            except OSError:
-                continue
-        signature.sort()
-        return tuple(signature)
-
-    def _rebuild_index(self) -> None:
-        files = _collect_files(self.settings.source_paths, self.settings.include_globs)
-        chunks: List[ChunkRecord] = []
-        df: Counter = Counter()
-
-        for file in files:
-            text = _safe_read_text(file, self.settings.max_file_size_kb)
-            if not text:
-                continue
-            parts = _split_text(text, self.settings.chunk_size, self.settings.chunk_overlap)
-            for idx, part in enumerate(parts):
-                tokens = _tokenize(part)
-                if not tokens:
-                    continue
-                tf = Counter(tokens)
-                norm = math.sqrt(sum(v * v for v in tf.values())) or 1.0
-                chunks.append(
-                    ChunkRecord(path=str(file), chunk_id=idx, text=part, tf=tf, norm=norm)
-                )
-                for token in tf.keys():
-                    df[token] += 1
-
-        total = max(1, len(chunks))
-        idf: Dict[str, float] = {}
-        for token, count in df.items():
-            idf[token] = math.log((1 + total) / (1 + count)) + 1.0
-
-        self._chunks = chunks
-        self._idf = idf
-        self._signature = self._current_signature()
-        logger.info("RAG index rebuilt: files=%d chunks=%d", len(files), len(chunks))
+    def _rebuild_index(self, files: Sequence[Tuple[Path, os.stat_result]]) -> None:
+        settings = self.settings
+        max_bytes = settings.max_file_size_kb * 1024
+        # Oversized files are skipped before any thread is spent on them.
+        jobs = tuple(
+            (str(file), st.st_mtime_ns, st.st_size)
+            for file, st in files
+            if st.st_size <= max_bytes
+        )
+        kb_key = (
+            settings.source_paths,
+            settings.include_globs,
+            settings.chunk_size,
+            settings.chunk_overlap,
+            settings.max_file_size_kb,
+        )
+        self._corpus = _shared_corpus(
+            kb_key,
+            jobs,
+            settings.chunk_size,
+            settings.chunk_overlap,
+            settings.max_file_size_kb,
+        )
 
     def ensure_index(self) -> None:
         if not self.settings.enabled:
             return
         with self._lock:
-            current = self._current_signature()
+            files = _collect_files(self.settings.source_paths, self._include_res)
+            current = _signature_of(files)
             if self._signature != current:
-                self._rebuild_index()
+                self._rebuild_index(files)
+                self._signature = current
 
     def retrieve(self, query: str, top_k: Optional[int] = None) -> List[ChunkRecord]:
         if not self.settings.enabled:
             return []
         self.ensure_index()
-        if not self._chunks:
+        corpus = self._corpus
+        if corpus is None or not corpus.chunks:
             return []
+        chunks, idf, index = corpus.chunks, corpus.idf, corpus.index
 
         query_tokens = _tokenize(query)
         if not query_tokens:
@@ -206,46 +432,58 @@ class LocalRAGEngine:
 
         q_tf = Counter(query_tokens)
         q_weights: Dict[str, float] = {
-            token: freq * self._idf.get(token, 1.0) for token, freq in q_tf.items()
+            token: freq * idf.get(token, 1.0) for token, freq in q_tf.items()
         }
         q_norm = math.sqrt(sum(v * v for v in q_weights.values())) or 1.0
 
-        scored: List[Tuple[float, ChunkRecord]] = []
-        for chunk in self._chunks:
-            dot = 0.0
-            for token, q_val in q_weights.items():
-                c_tf = chunk.tf.get(token)
-                if not c_tf:
-                    continue
-                dot += q_val * (c_tf * self._idf.get(token, 1.0))
-            if dot <= 0:
+        # Sparse mat-vec: gather the query terms' postings and sum per chunk.
+        row_parts: List[np.ndarray] = []
+        weight_parts: List[np.ndarray] = []
+        for token, q_val in q_weights.items():
+            col = index.vocab.get(token)
+            if col is None:
                 continue
-            score = dot / (q_norm * chunk.norm)
-            scored.append((score, chunk))
+            lo, hi = index.indptr[col], index.indptr[col + 1]
+            row_parts.append(index.rows[lo:hi])
+            weight_parts.append(index.weights[lo:hi] * (q_val / q_norm))
+        if not row_parts:
+            return []
 
-        scored.sort(key=lambda x: x[0], reverse=True)
+        scores = np.bincount(
+            np.concatenate(row_parts),
+            weights=np.concatenate(weight_parts),
+            minlength=len(chunks),
+        )
+        hit_rows = np.flatnonzero(scores > 0)
         k = max(1, top_k if top_k is not None else self.settings.top_k)
         min_score = max(0.0, float(self.settings.min_score))
         max_chunks_per_file = max(1, int(self.settings.max_chunks_per_file))
+        pool_size = k * _CANDIDATE_FANOUT
 
         selected: List[ChunkRecord] = []
         by_path: Counter[str] = Counter()
-        for score, chunk in scored:
-            if score < min_score:
-                continue
-            if by_path[chunk.path] >= max_chunks_per_file:
-                continue
-            selected.append(chunk)
-            by_path[chunk.path] += 1
-            if len(selected) >= k:
-                break
+        # The best score bounds every row: when it misses the threshold, skip
+        # straight to the fallback instead of ranking a pool that all fails.
+        if scores.max() >= min_score:
+            for row in _ranked_rows(scores, hit_rows, pool_size):
+                # Rows arrive best-first, so everything after this is below too.
+                if scores[row] < min_score:
+                    break
+                chunk = chunks[row]
+                if by_path[chunk.path] >= max_chunks_per_file:
+                    continue
+                selected.append(chunk)
+                by_path[chunk.path] += 1
+                if len(selected) >= k:
+                    break
 
         if selected:
             return selected
 
         # Fallback for overly strict thresholds: still return diversified top-k.
         by_path.clear()
-        for _, chunk in scored:
+        for row in _ranked_rows(scores, hit_rows, pool_size):
+            chunk = chunks[row]
             if by_path[chunk.path] >= max_chunks_per_file:
                 continue
             selected.append(chunk)
@@ -282,14 +520,15 @@ class LocalRAGEngine:
 
 
 _ENGINE_CACHE: Dict[RAGSettings, LocalRAGEngine] = {}
+_DISABLED_SETTINGS = RAGSettings(enabled=False)
 _ENGINE_LOCK = Lock()
 
 
 def settings_from_api_config(api_config: object) -> RAGSettings:
-    if api_config is None:
-        return RAGSettings(enabled=False)
+    # Disabled configs skip path/glob normalization (and the env lookup) entirely.
+    if api_config is None or not bool(getattr(api_config, "rag_enabled", True)):
+        return _DISABLED_SETTINGS
 
-    enabled = bool(getattr(api_config, "rag_enabled", True))
     top_k = int(getattr(api_config, "rag_top_k", 4) or 4)
     min_score = float(getattr(api_config, "rag_min_score", 0.08) or 0.08)
     max_chunks_per_file = int(getattr(api_config, "rag_max_chunks_per_file", 2) or 2)
@@ -312,7 +551,7 @@ def settings_from_api_config(api_config: object) -> RAGSettings:
         include = DEFAULT_INCLUDE_GLOBS
 
     return RAGSettings(
-        enabled=enabled,
+        enabled=True,
         top_k=top_k,
         min_score=min_score,
         max_chunks_per_file=max_chunks_per_file,
@@ -5,10 +5,14 @@ Local skill loader for prompt augmentation.
 
 from __future__ import annotations
 
+import os
 import re
+import stat
 from pathlib import Path
 from typing import Any, List, Tuple
 
+from .fileio import compile_globs, safe_read_text, walk_matching
+
 try:
     import yaml  # type: ignore
 except Exception:  # pragma: no cover
@@ -24,40 +28,105 @@ def _normalize_paths(paths: List[str] | None) -> List[Path]:
     return [Path(p).expanduser().resolve() for p in raw_paths if str(p).strip()]
 
 
-def _collect_skill_files(paths: List[Path], include_globs: List[str]) -> List[Path]:
-    files: list[Path] = []
+def _collect_skill_files(
+    paths: List[Path], include_globs: List[str]
+) -> List[Tuple[Path, os.stat_result]]:
+    """返回匹配 include_globs 的技能文件及其 stat，按路径排序。
+
+    目录遍历使用 core.fileio 的 scandir 遍历器与预编译 glob（不跟随目录符号链接）；
+    技能目录不套用 RAG 的排除目录表。
+    """
+    include_res = compile_globs(tuple(include_globs))
+    files: list[tuple[Path, os.stat_result]] = []
     seen: set[Path] = set()
     for base in paths:
-        if not base.exists():
+        try:
+            base_st = base.stat()
+        except OSError:
             continue
-        if base.is_file():
+        if not stat.S_ISDIR(base_st.st_mode):
             if base not in seen:
-                files.append(base)
+                files.append((base, base_st))
                 seen.add(base)
             continue
-        for pattern in include_globs:
-            for p in base.rglob(pattern):
-                if p.is_file() and p not in seen:
-                    files.append(p)
-                    seen.add(p)
-    files.sort()
+
+        for path, entry in walk_matching(str(base), include_res):
+            file_path = Path(path)
+            if file_path in seen:
+                continue
+            try:
+                files.append((file_path, entry.stat()))
+            except OSError:
+                continue
+            seen.add(file_path)
+    files.sort(key=lambda item: item[0])
     return files
 
 
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?(.*)$", flags=re.DOTALL)
+_META_LINE_RE = re.compile(r"^([A-Za-z_][\w-]*)\s*:\s*(.*?)\s*$")
+# 快速路径只接受 YAML 解析结果确定无歧义的写法：十进制整数（无前导零）与裸词
+_PLAIN_INT_RE = re.compile(r"^-?(?:0|[1-9][0-9]*)$")
+_BARE_WORD_RE = re.compile(r"^[^\W\d][\w\-. ]*$")
+# YAML 1.1 会把这些裸词解析为布尔值或 null
+_YAML_RESERVED_WORDS = frozenset({"yes", "no", "on", "off", "true", "false", "null"})
+_NOT_PLAIN = object()
+
+
+def _parse_plain(raw: str) -> Any:
+    """解析十进制整数或裸词；其他写法返回 _NOT_PLAIN 交给 YAML"""
+    if _PLAIN_INT_RE.match(raw):
+        return int(raw)
+    if _BARE_WORD_RE.match(raw) and raw.lower() not in _YAML_RESERVED_WORDS:
+        return raw
+    return _NOT_PLAIN
+
+
+def _parse_flat_meta(meta_raw: str) -> dict[str, Any] | None:
+    """解析单层 `key: value` / `key: [a, b]` 头部（值为整数或裸词）；其他写法返回 None"""
+    parsed: dict[str, Any] = {}
+    for line in meta_raw.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        match = _META_LINE_RE.match(line)
+        if not match:
+            return None
+        key, value = match.groups()
+        if key.lower() in _YAML_RESERVED_WORDS:
+            return None
+        if value.startswith("[") and value.endswith("]"):
+            inner = value[1:-1].strip()
+            items = [part.strip() for part in inner.split(",")] if inner else []
+            parsed_items = [_parse_plain(item) for item in items]
+            if any(item is _NOT_PLAIN for item in parsed_items):
+                return None
+            parsed[key] = parsed_items
+        else:
+            parsed_value = _parse_plain(value)
+            if parsed_value is _NOT_PLAIN:
+                return None
+            parsed[key] = parsed_value
+    return parsed
+
+
 def _split_frontmatter(text: str) -> Tuple[dict[str, Any], str]:
     if not text.startswith("---"):
         return {}, text
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n?(.*)$", text, flags=re.DOTALL)
+    match = _FRONTMATTER_RE.match(text)
     if not match:
         return {}, text
 
     meta_raw, body = match.groups()
-    if yaml is None:
-        return {}, body
-    try:
-        parsed = yaml.safe_load(meta_raw)
-    except Exception:
-        return {}, body
+    # 常见的扁平头部直接扫描，复杂写法（块列表、多行值等）才交给 YAML 解析器
+    parsed = _parse_flat_meta(meta_raw)
+    if parsed is None:
+        if yaml is None:
+            return {}, body
+        try:
+            parsed = yaml.safe_load(meta_raw)
+        except Exception:
+            return {}, body
     if not isinstance(parsed, dict):
         return {}, body
     return parsed, body
@@ -117,60 +186,86 @@ def _rel_path(path: Path) -> str:
         return str(path.resolve())
 
 
-def build_local_skill_context(api_config: object, agent_name: str = "") -> str:
-    enabled = bool(getattr(api_config, "skill_enabled", True))
-    if not enabled:
-        return ""
-
-    max_chars = int(getattr(api_config, "skill_max_context_chars", 4000) or 4000)
-    max_files = int(getattr(api_config, "skill_max_files", 8) or 8)
-    max_file_size_kb = int(getattr(api_config, "skill_max_file_size_kb", 256) or 256)
-    if max_chars <= 0 or max_files <= 0:
-        return ""
-
-    include_globs = getattr(api_config, "skill_include_globs", None) or DEFAULT_SKILL_GLOBS
-    paths = _normalize_paths(getattr(api_config, "skill_paths", None))
-    files = _collect_skill_files(paths, include_globs)
-    if not files:
-        return ""
-
-    candidates: list[tuple[int, str, Path, str]] = []
-    agent = (agent_name or "").strip().lower()
-    for file_path in files:
-        try:
-            if file_path.stat().st_size > max_file_size_kb * 1024:
-                continue
-            raw = file_path.read_text(encoding="utf-8", errors="ignore")
-        except OSError:
+# (priority, title, path, metadata, body)
+_SkillEntry = Tuple[int, str, Path, dict, str]
+
+# (路径, globs, 单文件上限) -> (文件签名, 按优先级排好序的技能条目)
+_SKILL_INDEX_CACHE: dict[tuple, tuple[tuple, list[_SkillEntry]]] = {}
+
+
+def _load_skill_index(
+    paths: List[Path],
+    include_globs: List[str],
+    max_file_size_kb: int,
+) -> list[_SkillEntry]:
+    """返回技能条目列表，已按优先级降序、路径升序排列。
+
+    以文件的 (路径, mtime_ns, size) 作为签名：未变化时直接复用上次解析结果，
+    多个 agent 连续调用只需重新扫描目录与 stat。
+    """
+    frozen_signature = tuple(
+        (file_path, st.st_mtime_ns, st.st_size)
+        for file_path, st in _collect_skill_files(paths, include_globs)
+    )
+    key = (tuple(paths), tuple(include_globs), max_file_size_kb)
+    cached = _SKILL_INDEX_CACHE.get(key)
+    if cached is not None and cached[0] == frozen_signature:
+        return cached[1]
+
+    entries: list[_SkillEntry] = []
+    for file_path, _, size in frozen_signature:
+        raw = safe_read_text(file_path, size, max_file_size_kb)
+        if raw is None:
             continue
 
         if not raw.strip():
             continue
 
         metadata, content = _split_frontmatter(raw)
-        if not _skill_applies_to_agent(metadata, agent):
-            continue
-
         body = content.strip()
         if not body:
             continue
 
-        candidates.append((
+        entries.append((
             _extract_priority(metadata),
             _skill_title(metadata, file_path),
             file_path,
+            metadata,
             body,
         ))
 
-    if not candidates:
+    entries.sort(key=lambda item: (-item[0], str(item[2]).lower()))
+    _SKILL_INDEX_CACHE[key] = (frozen_signature, entries)
+    return entries
+
+
+def build_local_skill_context(api_config: object, agent_name: str = "") -> str:
+    # 关闭或无预算时直接返回，不触碰任何路径
+    if not bool(getattr(api_config, "skill_enabled", True)):
         return ""
 
-    candidates.sort(key=lambda item: (-item[0], str(item[2]).lower()))
-    selected = candidates[:max_files]
+    max_chars = int(getattr(api_config, "skill_max_context_chars", 4000) or 4000)
+    max_files = int(getattr(api_config, "skill_max_files", 8) or 8)
+    if max_chars <= 0 or max_files <= 0:
+        return ""
+    max_file_size_kb = int(getattr(api_config, "skill_max_file_size_kb", 256) or 256)
+
+    include_globs = getattr(api_config, "skill_include_globs", None) or DEFAULT_SKILL_GLOBS
+    paths = _normalize_paths(getattr(api_config, "skill_paths", None))
+    entries = _load_skill_index(paths, include_globs, max_file_size_kb)
+    if not entries:
+        return ""
+
+    agent = (agent_name or "").strip().lower()
+    selected = [
+        entry for entry in entries if _skill_applies_to_agent(entry[3], agent)
+    ][:max_files]
+    if not selected:
+        return ""
 
     remaining = max_chars
     sections: list[str] = []
-    for _, title, file_path, content in selected:
+    for _, title, file_path, _, content in selected:
         if remaining <= 0:
             break
 
@@ -13,7 +13,7 @@
 import asyncio
 import json
 import threading
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -85,6 +85,8 @@ class WorkflowEngine:
         self._stages: Dict[str, Callable] = {}
         self._stage_descriptions: Dict[str, str] = {}
         self._stage_progress: Dict[str, int] = {}
+        # 注册时写入的 (描述, 进度)，_execute_stage 一次查表取得
+        self._progress_schedule: Dict[str, Tuple[str, int]] = {}
         self._supervisor: Optional[Callable] = None
 
         # Stage ↔ Agent mapping (single source of truth)
@@ -98,10 +100,12 @@ class WorkflowEngine:
         self._checkpoint_dir = checkpoint_dir
 
         self._stop_flag = threading.Event()
-        self._confirmation_event = threading.Event()
+        # 确认事件在 run() 所在的事件循环中创建；其他线程经 call_soon_threadsafe 唤醒
+        self._confirmation_event: Optional[asyncio.Event] = None
         self._confirmation_result: Optional[Dict] = None
 
         self._worker_thread: Optional[threading.Thread] = None
+        # _loop 为当前 run() 所在的事件循环
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
     @property
@@ -136,6 +140,7 @@ class WorkflowEngine:
         self._stages[key] = handler
         self._stage_descriptions[key] = description or key
         self._stage_progress[key] = progress
+        self._progress_schedule[key] = (description or key, progress)
         return self
 
     def set_supervisor(self, supervisor: Callable) -> 'WorkflowEngine':
@@ -169,6 +174,8 @@ class WorkflowEngine:
         self._state = WorkflowState.RUNNING
         self._stop_flag.clear()
         self._current_stage_index = resume_index
+        self._loop = asyncio.get_running_loop()
+        self._confirmation_event = asyncio.Event()
 
         await self.events.emit_async("workflow_started", {
             "stages": stages,
@@ -272,8 +279,7 @@ class WorkflowEngine:
             return StageResult(stage_key=stage_key, success=True)
 
         handler = self._stages[stage_key]
-        description = self._stage_descriptions.get(stage_key, stage_key)
-        progress = self._stage_progress.get(stage_key, 0)
+        description, progress = self._progress_schedule[stage_key]
 
         self._emit_progress(progress, description)
         self._emit_log(f"开始执行: {description}", "agent")
@@ -418,8 +424,10 @@ class WorkflowEngine:
         eval_result: Any
     ) -> Optional[Dict]:
         """等待用户确认"""
+        event = self._confirmation_event
+        assert event is not None, "run() 尚未创建确认事件"
         self._state = WorkflowState.WAITING_CONFIRMATION
-        self._confirmation_event.clear()
+        event.clear()
         self._confirmation_result = None
 
         agent_key = self._stage_to_agent_key(stage_key, [])
@@ -430,11 +438,14 @@ class WorkflowEngine:
             "context": self._context
         })
 
-        # 等待确认（使用 to_thread 避免忙轮询）
-        while not self._confirmation_event.is_set():
-            if self._stop_flag.is_set():
-                return None
-            await asyncio.to_thread(self._confirmation_event.wait, 1.0)
+        # clear() 会抹掉此前 stop() 安排的唤醒，等待前须再检查一次停止标志
+        if self._stop_flag.is_set():
+            return None
+
+        # confirm_stage() 与 stop() 都会唤醒等待，无需轮询或占用线程
+        await event.wait()
+        if self._stop_flag.is_set():
+            return None
 
         self._state = WorkflowState.RUNNING
         self._emit_log(f"用户已确认 {agent_key} 阶段", "success")
@@ -450,12 +461,23 @@ class WorkflowEngine:
             "modification": modification,
             "rollback_to": rollback_to
         }
-        self._confirmation_event.set()
+        self._wake_confirmation()
 
     def stop(self):
         """停止工作流"""
         self._stop_flag.set()
-        self._confirmation_event.set()  # 解除等待
+        self._wake_confirmation()  # 解除等待
+
+    def _wake_confirmation(self):
+        """从任意线程唤醒 _wait_for_confirmation"""
+        loop, event = self._loop, self._confirmation_event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # 事件循环已关闭：工作流已结束，无需唤醒
+            pass
 
     def _save_checkpoint(self, stage_key: str):
         """保存检查点"""
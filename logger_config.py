@@ -5,6 +5,7 @@
 提供统一的日志配置和管理。
 """
 
+import functools
 import logging
 import sys
 from pathlib import Path
@@ -20,6 +21,18 @@ LOG_LEVELS = {
     "CRITICAL": logging.CRITICAL,
 }
 
+_DEFAULT_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - "
+    "%(filename)s:%(lineno)d - %(message)s"
+)
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_formatter(format_string: str) -> logging.Formatter:
+    """按格式字符串共享 Formatter 实例（Formatter 无状态，可被多个处理器复用）"""
+    return logging.Formatter(format_string, datefmt=_DATE_FORMAT)
+
 
 def setup_logger(
     name: str = "autocontrol_scientist",
@@ -39,6 +52,11 @@ def setup_logger(
     Returns:
         配置好的 logger 实例
     """
+    # 快速路径：已配置过的 logger 直接返回，不经过 getLogger 的模块锁
+    existing = logging.Logger.manager.loggerDict.get(name)
+    if isinstance(existing, logging.Logger) and existing.handlers:
+        return existing
+
     logger = logging.getLogger(name)
 
     # 避免重复配置
@@ -49,14 +67,7 @@ def setup_logger(
     log_level = LOG_LEVELS.get(level.upper(), logging.INFO)
     logger.setLevel(log_level)
 
-    # 默认格式
-    if format_string is None:
-        format_string = (
-            "%(asctime)s - %(name)s - %(levelname)s - "
-            "%(filename)s:%(lineno)d - %(message)s"
-        )
-
-    formatter = logging.Formatter(format_string, datefmt="%Y-%m-%d %H:%M:%S")
+    formatter = _get_formatter(format_string or _DEFAULT_FORMAT)
 
     # 控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
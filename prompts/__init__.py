@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """Prompt模板管理模块"""
 
+import functools
+import json
+from os.path import basename
 from .prompt_loader import PromptLoader
 from typing import Dict, Any, TYPE_CHECKING
 
@@ -8,37 +11,42 @@ if TYPE_CHECKING:
     from global_context import GlobalContext
 
 
+@functools.cache
+def _get_loader() -> PromptLoader:
+    """延迟创建共享的模板加载器（首次渲染时才访问磁盘）"""
+    return PromptLoader(domain="control_systems")
+
+
 class PromptTemplates:
     """
     Agent提示词模板集合
     提供各Agent所需的prompt模板渲染
     """
-    
-    _loader = PromptLoader(domain="control_systems")
 
     @classmethod
     def architect_literature_search(cls, config: Dict[str, Any]) -> str:
         """
         架构师Agent文献检索与课题设计提示词
         """
-        main_algo = config.get("main_algorithm", {}).get("name", "")
-        objectives = [obj.get("name", "") for obj in config.get("performance_objectives", [])]
-        composite = config.get("composite_architecture", {})
-        feedback = composite.get("feedback", {}).get("name", "")
-        feedforward = composite.get("feedforward", {}).get("name", "")
-        observer = composite.get("observer", {}).get("name", "")
         custom_topic = config.get("custom_topic", "")
-
         if custom_topic:
             topic_section = f"自定义研究方向: {custom_topic}"
         else:
-            topic_section = f"""主算法: {main_algo}
-性能目标: {', '.join(objectives) if objectives else '未指定'}
-反馈控制: {feedback}
-前馈控制: {feedforward}
-观测器: {observer}"""
-
-        return cls._loader.load("architect", "literature_search", topic_section=topic_section)
+            main_algo = config.get("main_algorithm", {}).get("name", "")
+            objectives = [obj.get("name", "") for obj in config.get("performance_objectives", [])]
+            composite = config.get("composite_architecture", {})
+            feedback = composite.get("feedback", {}).get("name", "")
+            feedforward = composite.get("feedforward", {}).get("name", "")
+            observer = composite.get("observer", {}).get("name", "")
+            topic_section = "\n".join((
+                "主算法: " + main_algo,
+                "性能目标: " + (", ".join(objectives) if objectives else "未指定"),
+                "反馈控制: " + feedback,
+                "前馈控制: " + feedforward,
+                "观测器: " + observer,
+            ))
+
+        return _get_loader().load("architect", "literature_search", topic_section=topic_section)
 
     @classmethod
     def theorist_derivation(cls, context: 'GlobalContext') -> str:
@@ -67,7 +75,7 @@ class PromptTemplates:
 {context.research_motivation if context.research_motivation else ''}
 """
 
-        return cls._loader.load(
+        return _get_loader().load(
             "theorist", "derivation",
             research_topic=context.research_topic,
             main_algo=main_algo,
@@ -110,7 +118,7 @@ class PromptTemplates:
         if context.parameter_tuning_guide:
             tuning_guide_preview = f"\n【参数整定指南】\n{context.parameter_tuning_guide[:1500]}"
 
-        return cls._loader.load(
+        return _get_loader().load(
             "engineer", "matlab_simulation",
             research_topic=context.research_topic,
             main_algo=main_algo,
@@ -131,7 +139,7 @@ class PromptTemplates:
         matlab_code_preview = context.matlab_code[:3000] if context.matlab_code else "待定义"
         control_law_latex = context.control_law_latex[:1500] if context.control_law_latex else "见MATLAB代码"
         
-        return cls._loader.load(
+        return _get_loader().load(
             "dsp_coder", "dsp_generation",
             matlab_code_preview=matlab_code_preview,
             control_law_latex=control_law_latex
@@ -140,7 +148,7 @@ class PromptTemplates:
     @classmethod
     def simulator_fix_code(cls, error_msg: str, code: str) -> str:
         """仿真代码自动修复提示词"""
-        return cls._loader.load(
+        return _get_loader().load(
             "simulator", "fix_code",
             error_msg=error_msg[:1000],
             code=code
@@ -153,13 +161,13 @@ class PromptTemplates:
         figures = context.simulation_results.get("figures", [])
         metrics = context.simulation_metrics or {}
         
-        return cls._loader.load(
+        return _get_loader().load(
             "simulator", "analysis",
             research_topic=context.research_topic,
             matlab_code_preview=context.matlab_code[:1500] if context.matlab_code else '(无)',
             stdout_preview=stdout[:2000] if stdout else '(无输出)',
             metrics_json=json.dumps(metrics, ensure_ascii=False) if metrics else '(无)',
-            figures_list=', '.join([Path(f).name for f in figures]) if figures else '(无图像)'
+            figures_list=', '.join(basename(f) for f in figures) if figures else '(无图像)'
         )
 
     @classmethod
@@ -168,7 +176,7 @@ class PromptTemplates:
         issues = analysis.get("issues", [])
         suggestions = analysis.get("parameter_suggestions", {})
         
-        return cls._loader.load(
+        return _get_loader().load(
             "simulator", "refine",
             issues_text='\n'.join(f'- {issue}' for issue in issues),
             suggestions_json=json.dumps(suggestions, ensure_ascii=False, indent=2) if suggestions else '(无具体建议)',
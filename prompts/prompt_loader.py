@@ -4,9 +4,26 @@ Prompt模板加载器 - AutoControl-Scientist
 从YAML文件加载并渲染Prompt模板
 """
 
+import mmap
+import os
 import yaml
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+# 模板根目录（模块加载时解析一次）
+_BASE = Path(__file__).resolve().parent
+
+# 超过该大小的模板文件通过 mmap 交给解析器
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _read_yaml(path: Path) -> Any:
+    """解析YAML文件；大文件直接映射给解析器读取，避免整体读入内存"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return yaml.safe_load(mm)
+        return yaml.safe_load(f)
 
 
 class PromptLoader:
@@ -15,12 +32,25 @@ class PromptLoader:
 
     从 prompts/<domain>/ 目录加载YAML模板文件，
     支持变量替换渲染。
+
+    模板查找顺序:
+    1. 分片文件 prompts/<domain>/<agent>/<prompt_key>.yaml（仅解析所需模板）
+    2. 整体文件 prompts/<domain>/<agent>.yaml（兼容旧布局）
+
+    分片文件即整体文件中 prompts.<prompt_key> 条目的内容，提升为顶层映射，
+    必须包含 template 键，例如::
+
+        template: |
+          MATLAB代码执行出错: {error_msg}
+        variables:
+          - error_msg
     """
 
     def __init__(self, domain: str = "control_systems"):
         self.domain = domain
-        self.prompts_dir = Path(__file__).parent / domain
+        self.prompts_dir = _BASE / domain
         self._cache: Dict[str, dict] = {}
+        self._shard_cache: Dict[Tuple[str, str], dict] = {}
 
         if not self.prompts_dir.exists():
             raise FileNotFoundError(
@@ -39,47 +69,74 @@ class PromptLoader:
         Returns:
             渲染后的prompt字符串
         """
-        if agent_name not in self._cache:
-            yaml_path = self.prompts_dir / f"{agent_name}.yaml"
-            if not yaml_path.exists():
-                raise FileNotFoundError(
-                    f"Prompt模板文件不存在: {yaml_path}"
+        shard_key = (agent_name, prompt_key)
+        entry = self._shard_cache.get(shard_key)
+        if entry is None:
+            entry = self._load_entry(agent_name, prompt_key)
+            self._shard_cache[shard_key] = entry
+
+        return entry["template"].format(**kwargs)
+
+    def _load_entry(self, agent_name: str, prompt_key: str) -> dict:
+        """读取单个模板条目：优先分片文件，缺失时回退到整体文件"""
+        shard_path = self.prompts_dir / agent_name / f"{prompt_key}.yaml"
+        if shard_path.is_file():
+            entry = _read_yaml(shard_path)
+            if not isinstance(entry, dict) or "template" not in entry:
+                raise KeyError(
+                    f"分片模板文件缺少顶层 'template' 键: {shard_path}"
                 )
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                self._cache[agent_name] = yaml.safe_load(f)
+            return entry
 
-        prompts = self._cache[agent_name].get("prompts", {})
-        if prompt_key not in prompts:
+        prompts: Dict[str, dict] = self._ensure_loaded(agent_name).get("prompts", {})
+        fallback = prompts.get(prompt_key)
+        if fallback is None:
             raise KeyError(
                 f"模板 '{prompt_key}' 在 {agent_name}.yaml 中不存在"
             )
+        return fallback
 
-        template = prompts[prompt_key]["template"]
-        return template.format(**kwargs)
-
-    def get_available_prompts(self, agent_name: str) -> list:
-        """获取指定Agent的所有可用模板键名"""
-        if agent_name not in self._cache:
+    def _ensure_loaded(self, agent_name: str) -> dict:
+        """返回Agent整体模板文件的解析结果，首次访问时解析并缓存"""
+        cached = self._cache.get(agent_name)
+        if cached is None:
             yaml_path = self.prompts_dir / f"{agent_name}.yaml"
             if not yaml_path.exists():
-                return []
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                self._cache[agent_name] = yaml.safe_load(f)
+                raise FileNotFoundError(
+                    f"Prompt模板文件不存在: {yaml_path}"
+                )
+            self._cache[agent_name] = cached = _read_yaml(yaml_path) or {}
+        return cached
+
+    def get_available_prompts(self, agent_name: str) -> list:
+        """获取指定Agent的所有可用模板键名（分片模板 + 整体文件模板）"""
+        shard_dir = self.prompts_dir / agent_name
+        keys = sorted(p.stem for p in shard_dir.glob("*.yaml")) if shard_dir.is_dir() else []
+
+        try:
+            prompts = self._ensure_loaded(agent_name).get("prompts", {})
+        except FileNotFoundError:
+            return keys
 
-        return list(self._cache[agent_name].get("prompts", {}).keys())
+        keys.extend(k for k in prompts if k not in keys)
+        return keys
 
     def reload(self, agent_name: Optional[str] = None):
         """重新加载模板（清除缓存）"""
         if agent_name:
             self._cache.pop(agent_name, None)
+            for key in [k for k in self._shard_cache if k[0] == agent_name]:
+                del self._shard_cache[key]
         else:
             self._cache.clear()
+            self._shard_cache.clear()
 
     def set_domain(self, domain: str):
         """切换研究领域"""
         self.domain = domain
-        self.prompts_dir = Path(__file__).parent / domain
+        self.prompts_dir = _BASE / domain
         self._cache.clear()
+        self._shard_cache.clear()
         if not self.prompts_dir.exists():
             raise FileNotFoundError(
                 f"Prompt模板目录不存在: {self.prompts_dir}"
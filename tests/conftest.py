@@ -4,8 +4,18 @@ pytest 配置文件
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import pytest
+
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(scope="session")
+def thread_pool():
+    """整个测试会话共享的线程池，供并发测试复用"""
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        yield pool
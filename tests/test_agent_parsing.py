@@ -5,9 +5,6 @@ Agent Mock 测试 - 测试 LLM 返回结果的解析
 
 import pytest
 import json
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 class TestArchitectAgentParsing:
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import threading
 import time
 
 import pytest
@@ -21,7 +20,7 @@ class DummyHistory:
 
 class DummyOrchestrator:
     def __init__(self):
-        self.events = EventEmitter()
+        self.events = EventEmitter.acquire()
         self._state = WorkflowState.IDLE
         self.started_config = None
         self.stop_called = False
@@ -46,25 +45,35 @@ class DummyOrchestrator:
         return None
 
 
-@pytest.fixture
-def manager(monkeypatch):
-    orchestrators = []
+class _TestSessionManager(session_manager_module.SessionManager):
+    """以 Dummy 替身创建会话、不注册真实 agent 的 SessionManager"""
+
+    def __init__(self, orchestrator_cls=DummyOrchestrator):
+        super().__init__(
+            orchestrator_factory=self._make_orchestrator,
+            history_factory=DummyHistory,
+        )
+        self._orchestrator_cls = orchestrator_cls
+        self.orchestrators = []
 
-    def factory(output_dir):  # noqa: ARG001
-        orchestrator = DummyOrchestrator()
-        orchestrators.append(orchestrator)
+    def _make_orchestrator(self, output_dir):
+        orchestrator = self._orchestrator_cls()
+        self.orchestrators.append(orchestrator)
         return orchestrator
 
-    monkeypatch.setattr(session_manager_module, "ResearchOrchestrator", factory)
-    monkeypatch.setattr(session_manager_module, "AgentHistory", DummyHistory)
-    monkeypatch.setattr(
-        session_manager_module.SessionManager,
-        "_register_agents",
-        lambda self, orchestrator: None,
-    )
+    def _register_agents(self, orchestrator):
+        return None
+
 
-    mgr = session_manager_module.SessionManager()
-    return mgr, orchestrators
+def set_created_at(session, age_seconds):
+    session.created_at = time.monotonic() - age_seconds
+
+
+@pytest.fixture
+def manager(request):
+    mgr = _TestSessionManager()
+    request.addfinalizer(lambda: [o.events.release() for o in mgr.orchestrators])
+    return mgr, mgr.orchestrators
 
 
 class TestSessionManager:
@@ -90,6 +99,30 @@ class TestSessionManager:
         assert events[0]["_seq"] == 6
         assert events[-1]["_seq"] == session_manager_module.MAX_EVENT_LOG + 5
 
+    def test_event_log_indexes_without_copy(self, manager):
+        mgr, orchestrators = manager
+        session = mgr.create_session({"topic": "test"})
+        orchestrator = orchestrators[0]
+
+        assert session.event_log.peek_last() is None
+        assert session.event_log.peek_first() is None
+
+        for i in range(session_manager_module.MAX_EVENT_LOG + 5):
+            orchestrator.events.emit("log_message", {"index": i})
+
+        log = session.event_log
+        assert log[0] is log.peek_first()
+        assert log[-1] is log.peek_last()
+        assert log[0]["_seq"] == 6
+        assert log[-1]["_seq"] == session_manager_module.MAX_EVENT_LOG + 5
+        assert log[1]["_seq"] == 7
+        assert [e["_seq"] for e in log[-2:]] == [
+            session_manager_module.MAX_EVENT_LOG + 4,
+            session_manager_module.MAX_EVENT_LOG + 5,
+        ]
+        with pytest.raises(IndexError):
+            log[session_manager_module.MAX_EVENT_LOG]
+
     def test_delete_session_stops_running_workflow(self, manager):
         mgr, orchestrators = manager
         session = mgr.create_session({})
@@ -112,9 +145,9 @@ class TestSessionManager:
         orchestrators[1]._state = WorkflowState.RUNNING
         orchestrators[2]._state = WorkflowState.ERROR
 
-        old_terminal.created_at = time.time() - 3600
-        old_running.created_at = time.time() - 3600
-        recent_terminal.created_at = time.time()
+        set_created_at(old_terminal, 3600)
+        set_created_at(old_running, 3600)
+        set_created_at(recent_terminal, 0)
 
         cleaned = mgr.cleanup_stale_sessions(max_age_seconds=10)
 
@@ -123,6 +156,32 @@ class TestSessionManager:
         assert mgr.get_session(old_running.session_id) is not None
         assert mgr.get_session(recent_terminal.session_id) is not None
 
+    def test_concurrent_creates_keep_creation_order_sorted(self, manager, thread_pool):
+        mgr, _ = manager
+
+        futures = [thread_pool.submit(mgr.create_session, {"n": i}) for i in range(32)]
+        sessions = [future.result() for future in futures]
+
+        stamps = [s.created_at for s in mgr._by_ctime]
+        assert stamps == sorted(stamps)
+        assert {s.session_id for s in mgr._by_ctime} == {s.session_id for s in sessions}
+
+    def test_cleanup_stale_sessions_removes_batch_and_keeps_order(self, manager):
+        mgr, orchestrators = manager
+        sessions = [mgr.create_session({"n": i}) for i in range(6)]
+        for i, session in enumerate(sessions):
+            set_created_at(session, 3600 - i)
+        for i in (0, 2, 3):
+            orchestrators[i]._state = WorkflowState.COMPLETED
+
+        cleaned = mgr.cleanup_stale_sessions(max_age_seconds=10)
+
+        assert cleaned == 3
+        assert [s.session_id for s in mgr._by_ctime] == [
+            sessions[i].session_id for i in (1, 4, 5)
+        ]
+        assert all(sessions[i].event_notifier.is_set() for i in (0, 2, 3))
+
     def test_progress_event_tolerates_non_dict_payload(self, manager):
         mgr, orchestrators = manager
         session = mgr.create_session({"topic": "robust-progress"})
@@ -149,43 +208,42 @@ class TestSessionManager:
         assert status["progress"] == 100
         assert session.event_log[-1]["type"] == "completed"
 
-    def test_concurrent_delete_is_safe(self, manager):
-        mgr, _ = manager
-        session = mgr.create_session({"topic": "race"})
+    def test_status_never_runs_ahead_of_event_log(self, manager, thread_pool):
+        mgr, orchestrators = manager
+        session = mgr.create_session({"topic": "atomic"})
+        orchestrator = orchestrators[0]
 
-        results = []
+        # 事件日志写入被阻塞时，状态读取者不能先看到 progress=100
+        with session.event_log._lock:
+            emitted = thread_pool.submit(
+                orchestrator.events.emit, "workflow_completed", {"ok": True}
+            )
+            time.sleep(0.05)
+            status = thread_pool.submit(mgr.get_status, session.session_id)
+            time.sleep(0.05)
+            assert not status.done()
+        emitted.result(timeout=5)
+
+        assert status.result(timeout=5)["progress"] == 100
+        assert session.event_log[-1]["type"] == "completed"
 
-        def worker():
-            results.append(mgr.delete_session(session.session_id))
+    def test_concurrent_delete_is_safe(self, manager, thread_pool):
+        mgr, _ = manager
+        session = mgr.create_session({"topic": "race"})
 
-        threads = [threading.Thread(target=worker) for _ in range(8)]
-        for thread in threads:
-            thread.start()
-        for thread in threads:
-            thread.join()
+        futures = [thread_pool.submit(mgr.delete_session, session.session_id) for _ in range(8)]
+        results = [future.result() for future in futures]
 
         assert results.count(True) == 1
         assert results.count(False) == 7
 
 
-def test_create_session_rolls_back_when_start_fails(monkeypatch):
+def test_create_session_rolls_back_when_start_fails():
     class FailingOrchestrator(DummyOrchestrator):
         def start_workflow(self, config):  # noqa: ARG002
             raise RuntimeError("boom")
 
-    monkeypatch.setattr(
-        session_manager_module,
-        "ResearchOrchestrator",
-        lambda output_dir: FailingOrchestrator(),  # noqa: ARG005
-    )
-    monkeypatch.setattr(session_manager_module, "AgentHistory", DummyHistory)
-    monkeypatch.setattr(
-        session_manager_module.SessionManager,
-        "_register_agents",
-        lambda self, orchestrator: None,
-    )
-
-    mgr = session_manager_module.SessionManager()
+    mgr = _TestSessionManager(FailingOrchestrator)
     with pytest.raises(RuntimeError, match="boom"):
         mgr.create_session({"topic": "will-fail"})
 
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import json
+
 import pytest
 
+from api import ws_handler as ws_handler_module
 from api.ws_handler import ConnectionManager
+from core.events import Event
 
 
 class FakeWebSocket:
@@ -20,6 +24,17 @@ class FakeWebSocket:
         self.messages.append(message)
 
 
+class FakeTextWebSocket(FakeWebSocket):
+    def __init__(self, fail_send=False):
+        super().__init__(fail_send=fail_send)
+        self.texts = []
+
+    async def send_text(self, text):
+        if self.fail_send:
+            raise RuntimeError("socket closed")
+        self.texts.append(text)
+
+
 class TestConnectionManager:
     @pytest.mark.asyncio
     async def test_connect_and_disconnect(self):
@@ -56,3 +71,60 @@ class TestConnectionManager:
 
         assert alive.messages == [{"type": "log", "data": {"ok": True}}]
         assert manager._connections["session-1"] == [alive]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_pre_encoded_text_in_batches(self, monkeypatch):
+        monkeypatch.setattr(ws_handler_module, "BROADCAST_BATCH_SIZE", 2)
+        manager = ConnectionManager()
+        sockets = [FakeTextWebSocket() for _ in range(4)]
+        dead = FakeTextWebSocket(fail_send=True)
+        for ws in [*sockets, dead]:
+            await manager.connect("session-1", ws)
+
+        message = {"type": "log", "data": {"message": "中文"}}
+        await manager.broadcast("session-1", message)
+
+        for ws in sockets:
+            assert len(ws.texts) == 1
+            assert json.loads(ws.texts[0]) == message
+            assert ws.messages == []
+        assert sockets[0].texts[0] is sockets[3].texts[0]
+        assert manager._connections["session-1"] == sockets
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_non_str_keys_and_wide_ints(self):
+        manager = ConnectionManager()
+        ws = FakeTextWebSocket()
+        await manager.connect("session-1", ws)
+
+        await manager.broadcast("session-1", {"type": "log", "data": {1: "a"}})
+        await manager.broadcast("session-1", {"type": "log", "data": 2 ** 70})
+
+        assert [json.loads(text) for text in ws.texts] == [
+            {"type": "log", "data": {"1": "a"}},
+            {"type": "log", "data": 2 ** 70},
+        ]
+        assert manager._connections["session-1"] == [ws]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_event_reuses_cached_encoding(self):
+        manager = ConnectionManager()
+        text_ws = FakeTextWebSocket()
+        json_ws = FakeWebSocket()
+        await manager.connect("session-1", text_ws)
+        await manager.connect("session-2", json_ws)
+
+        event = Event(type="log_message", data={"message": "中文"}, source="test")
+        await manager.broadcast("session-1", event)
+        cached = event.as_json_bytes
+        await manager.broadcast("session-2", event)
+
+        assert event.as_json_bytes is cached
+        assert json.loads(text_ws.texts[0]) == event.to_dict()
+        assert json_ws.messages == [event.to_dict()]
+
+    def test_event_and_dict_share_encoder(self):
+        event = Event(type="log", data={1: "a", "big": 2 ** 70}, source="test")
+
+        assert event.as_json_bytes.decode("utf-8") == ws_handler_module.encode_message(event.to_dict())
+        assert json.loads(event.as_json_bytes)["data"] == {"1": "a", "big": 2 ** 70}
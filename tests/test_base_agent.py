@@ -73,6 +73,15 @@ class TestAPIConfig:
         assert config_dict["timeout"] == 120
         assert config_dict["max_retries"] == 5
 
+    def test_api_config_to_dict_lists_are_independent(self):
+        """测试 to_dict 返回的列表不与缓存或字段共享"""
+        config = APIConfig(provider="openai", base_url="", api_key="", model="gpt-4")
+        config.to_dict()["rag_paths"].append("./extra")
+        assert "./extra" not in config.to_dict()["rag_paths"]
+
+        config.skill_paths.append("./more_skills")
+        assert config.to_dict()["skill_paths"][-1] == "./more_skills"
+
 
 class TestSupervisorFeedback:
     """测试 SupervisorFeedback 数据类"""
@@ -8,6 +8,7 @@ import json
 import tempfile
 from pathlib import Path
 
+import config_manager as config_manager_module
 from config_manager import (
     ConfigManager, AgentConfig, AppSettings
 )
@@ -49,6 +50,21 @@ class TestAgentConfig:
         assert config_dict["api_key"] == "***key"  # 应该被掩码
         assert config_dict["enabled"] is False
 
+    def test_agent_config_to_dict_lists_are_independent(self):
+        """测试 to_dict 返回的列表不与缓存或字段共享"""
+        config = AgentConfig(
+            agent_type="theorist",
+            provider_name="Anthropic",
+            api_key="test-key",
+            base_url="https://api.anthropic.com",
+            model_name="claude-3-opus",
+        )
+        config.to_dict()["rag_paths"].append("./extra")
+        assert "./extra" not in config.to_dict()["rag_paths"]
+
+        config.skill_paths.append("./more_skills")
+        assert config.to_dict()["skill_paths"][-1] == "./more_skills"
+
 
 class TestAppSettings:
     """测试 AppSettings 数据类"""
@@ -171,3 +187,37 @@ class TestConfigManager:
         """测试设置 MATLAB 路径"""
         config_manager.set_matlab_path("/usr/local/MATLAB/R2023a")
         assert config_manager.settings.matlab_path == "/usr/local/MATLAB/R2023a"
+
+    def test_save_load_roundtrip_without_orjson(self, config_manager, monkeypatch):
+        """测试 orjson 不可用时使用标准库 json 保存与读取"""
+        monkeypatch.setattr(config_manager_module, "orjson", None)
+        config = AgentConfig(
+            agent_type="scribe",
+            provider_name="本地模型",
+            api_key="secret-key",
+            base_url="http://localhost:8080",
+            model_name="qwen",
+        )
+        config_manager.add_agent(config)
+        assert config_manager.save()
+
+        raw = config_manager.config_path.read_bytes()
+        data = json.loads(raw)
+        assert raw == json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+        assert "本地模型".encode("utf-8") in raw
+
+        reloaded = ConfigManager(config_file=str(config_manager.config_path))
+        agent = reloaded.get_agent_by_type("scribe")
+        assert agent.provider_name == "本地模型"
+        assert agent.api_key == "secret-key"
+
+    def test_stdlib_json_layout_matches_orjson(self, monkeypatch):
+        """测试标准库回退的字节布局与 orjson 一致"""
+        orjson = pytest.importorskip("orjson")
+        data = {"agents": [{"name": "理论家", "paths": ["./docs"], "empty": []}], "n": 1}
+        expected = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+        monkeypatch.setattr(config_manager_module, "orjson", None)
+        assert config_manager_module._dump_json_bytes(data) == expected
+        assert config_manager_module._load_json_bytes(expected) == data
+
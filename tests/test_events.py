@@ -8,10 +8,6 @@ import asyncio
 import threading
 import time
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from core.events import EventEmitter, Event, EventType
 
 
@@ -126,6 +122,24 @@ class TestEventEmitter:
 
         assert results == ["a", "b", "c"]
 
+    def test_emit_dispatches_only_matching_type(self):
+        """测试发射只调用该事件类型的监听器，移除后不残留空条目"""
+        emitter = EventEmitter()
+        results = []
+
+        for i in range(50):
+            emitter.on(f"other_{i}", lambda e: results.append("other"))
+        handler = lambda e: results.append(e.type)  # noqa: E731
+        emitter.on("target", handler)
+
+        emitter.emit("target")
+        assert results == ["target"]
+
+        emitter.off("target", handler)
+        assert "target" not in emitter._listeners
+        assert emitter.listener_count("target") == 0
+        assert emitter.listener_count() == 50
+
     def test_event_history(self):
         """测试事件历史记录"""
         emitter = EventEmitter()
@@ -140,6 +154,36 @@ class TestEventEmitter:
         event1_history = emitter.get_history("event1")
         assert len(event1_history) == 2
 
+    def test_event_history_limit_zero_returns_all(self):
+        """测试 limit=0 返回全部历史"""
+        emitter = EventEmitter()
+        for i in range(3):
+            emitter.emit("event", i)
+
+        assert [e.data for e in emitter.get_history(limit=0)] == [0, 1, 2]
+        assert [e.data for e in emitter.get_history("event", limit=2)] == [1, 2]
+
+    def test_event_history_concurrent_emit(self):
+        """测试并发发射时读取历史不会出错"""
+        emitter = EventEmitter(max_history=50)
+        stop = threading.Event()
+
+        def produce():
+            while not stop.is_set():
+                emitter.emit("tick")
+
+        producers = [threading.Thread(target=produce, daemon=True) for _ in range(2)]
+        for t in producers:
+            t.start()
+        try:
+            for _ in range(5000):
+                emitter.get_history(limit=20)
+                emitter.get_history("tick", limit=20)
+        finally:
+            stop.set()
+            for t in producers:
+                t.join()
+
     def test_listener_count(self):
         """测试监听器计数"""
         emitter = EventEmitter()
@@ -184,7 +228,7 @@ class TestEventEmitter:
 
         assert results == ["ok"]
 
-    def test_thread_safety(self):
+    def test_thread_safety(self, thread_pool):
         """测试线程安全"""
         emitter = EventEmitter()
         results = []
@@ -196,18 +240,25 @@ class TestEventEmitter:
 
         emitter.on("event", handler)
 
-        threads = []
-        for i in range(10):
-            t = threading.Thread(target=lambda x=i: emitter.emit("event", x))
-            threads.append(t)
+        futures = [thread_pool.submit(emitter.emit, "event", i) for i in range(10)]
+        for future in futures:
+            future.result()
 
-        for t in threads:
-            t.start()
+        assert len(results) == 10
 
-        for t in threads:
-            t.join()
+    def test_acquire_release_resets_pooled_emitter(self):
+        """测试对象池归还后再次取出的发射器为干净状态"""
+        emitter = EventEmitter.acquire()
+        emitter.on("event", lambda e: None)
+        emitter.emit("event", "data")
+        emitter.release()
 
-        assert len(results) == 10
+        reused = EventEmitter.acquire()
+        try:
+            assert reused.listener_count() == 0
+            assert reused.get_history() == []
+        finally:
+            reused.release()
 
 
 class TestAsyncEventEmitter:
@@ -248,6 +299,68 @@ class TestAsyncEventEmitter:
         assert "sync" in results
         assert "async" in results
 
+    @pytest.mark.asyncio
+    async def test_async_handlers_run_concurrently(self):
+        """测试异步处理器并发执行，单个失败不影响其他处理器"""
+        emitter = EventEmitter()
+        started = []
+        release = asyncio.Event()
+
+        async def waiting_handler(event: Event):
+            started.append("waiting")
+            await release.wait()
+
+        async def releasing_handler(event: Event):
+            started.append("releasing")
+            release.set()
+
+        async def failing_handler(event: Event):
+            raise RuntimeError("boom")
+
+        emitter.on_async("event", waiting_handler)
+        emitter.on_async("event", failing_handler)
+        emitter.on_async("event", releasing_handler)
+
+        await asyncio.wait_for(emitter.emit_async("event"), timeout=1.0)
+
+        assert started == ["waiting", "releasing"]
+
+    @pytest.mark.asyncio
+    async def test_plain_async_listeners_run_before_coroutines(self):
+        """测试异步监听器中的普通函数先于协程回调执行"""
+        emitter = EventEmitter()
+        order = []
+
+        async def coroutine_handler(event: Event):
+            order.append("coroutine")
+
+        emitter.on_async("event", coroutine_handler)
+        emitter.on_async("event", lambda event: order.append("plain"))
+
+        await emitter.emit_async("event")
+
+        assert order == ["plain", "coroutine"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_handler_propagates_after_others_finish(self):
+        """测试协程回调的 CancelledError 不被吞掉，且其余回调照常完成"""
+        emitter = EventEmitter()
+        finished = []
+
+        async def cancelled_handler(event: Event):
+            raise asyncio.CancelledError()
+
+        async def normal_handler(event: Event):
+            await asyncio.sleep(0)
+            finished.append("normal")
+
+        emitter.on_async("event", cancelled_handler)
+        emitter.on_async("event", normal_handler)
+
+        with pytest.raises(asyncio.CancelledError):
+            await emitter.emit_async("event")
+        assert finished == ["normal"]
+
 
 class TestEventType:
     """EventType 枚举测试"""
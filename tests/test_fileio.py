@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+from core.fileio import compile_globs, safe_read_text, walk_matching
+
+
+def test_safe_read_text_normalizes_line_endings(tmp_path):
+    path = tmp_path / "notes.md"
+    path.write_bytes(b"a\r\nb\rc\n")
+
+    assert safe_read_text(path, path.stat().st_size, 1) == "a\nb\nc\n"
+
+
+def test_safe_read_text_rejects_oversized_and_missing_files(tmp_path):
+    path = tmp_path / "big.txt"
+    path.write_bytes(b"x" * 2048)
+
+    assert safe_read_text(path, 2048, 1) is None
+    assert safe_read_text(tmp_path / "missing.txt", 0, 1) is None
+
+
+def test_walk_matching_filters_globs_and_prunes_excluded_names(tmp_path):
+    (tmp_path / "keep.md").write_text("k", encoding="utf-8")
+    (tmp_path / "skip.py").write_text("s", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "nested.md").write_text("n", encoding="utf-8")
+    (tmp_path / "output").mkdir()
+    (tmp_path / "output" / "pruned.md").write_text("p", encoding="utf-8")
+
+    include_res = compile_globs(("*.md",))
+    found = {p for p, _ in walk_matching(str(tmp_path), include_res, frozenset({"output"}))}
+    unfiltered = {p for p, _ in walk_matching(str(tmp_path), include_res)}
+
+    assert found == {str(tmp_path / "keep.md"), str(tmp_path / "sub" / "nested.md")}
+    assert unfiltered == found | {str(tmp_path / "output" / "pruned.md")}
+    assert compile_globs(("*.md",)) is include_res
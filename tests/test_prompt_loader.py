@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+PromptLoader 单元测试
+"""
+
+import pytest
+
+from prompts import prompt_loader as prompt_loader_module
+from prompts.prompt_loader import PromptLoader
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """在临时目录中构造 demo 领域：整体文件 + 一个分片模板"""
+    domain_dir = tmp_path / "demo"
+    domain_dir.mkdir()
+    (domain_dir / "simulator.yaml").write_text(
+        "agent: simulator\n"
+        "prompts:\n"
+        "  analysis:\n"
+        "    template: \"monolithic {name}\"\n"
+        "  fix_code:\n"
+        "    template: \"fix {error_msg}\"\n",
+        encoding="utf-8",
+    )
+    shard_dir = domain_dir / "simulator"
+    shard_dir.mkdir()
+    (shard_dir / "analysis.yaml").write_text(
+        "template: \"shard {name}\"\nvariables:\n  - name\n",
+        encoding="utf-8",
+    )
+    (shard_dir / "refine.yaml").write_text("template: \"refine {name}\"\n", encoding="utf-8")
+    monkeypatch.setattr(prompt_loader_module, "_BASE", tmp_path)
+    return PromptLoader(domain="demo")
+
+
+def test_shard_file_takes_precedence(loader):
+    assert loader.load("simulator", "analysis", name="x") == "shard x"
+
+
+def test_falls_back_to_monolithic_file(loader):
+    assert loader.load("simulator", "fix_code", error_msg="boom") == "fix boom"
+
+
+def test_available_prompts_merges_shards_and_monolithic(loader):
+    assert loader.get_available_prompts("simulator") == ["analysis", "refine", "fix_code"]
+
+
+def test_shard_without_template_names_path(loader):
+    shard_path = loader.prompts_dir / "simulator" / "broken.yaml"
+    shard_path.write_text("variables:\n  - name\n", encoding="utf-8")
+
+    with pytest.raises(KeyError, match="broken.yaml"):
+        loader.load("simulator", "broken")
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+PromptTemplates 渲染测试
+"""
+
+from types import SimpleNamespace
+
+from prompts import PromptTemplates
+
+
+def test_simulator_analysis_renders_figures_and_metrics():
+    context = SimpleNamespace(
+        research_topic="滑模控制",
+        matlab_code="K = 10;",
+        simulation_results={"stdout": "done", "figures": ["/tmp/out/step_response.png"]},
+        simulation_metrics={"overshoot": 5.2},
+    )
+
+    prompt = PromptTemplates.simulator_analysis(context)
+
+    assert "step_response.png" in prompt
+    assert "/tmp/out" not in prompt
+    assert '"overshoot": 5.2' in prompt
+
+
+def test_simulator_refine_renders_issues_and_suggestions():
+    analysis = {
+        "issues": ["超调过大"],
+        "parameter_suggestions": {"K": "减小到 5"},
+    }
+
+    prompt = PromptTemplates.simulator_refine("K = 10;", analysis)
+
+    assert "- 超调过大" in prompt
+    assert '"K": "减小到 5"' in prompt
+    assert "K = 10;" in prompt
@@ -3,13 +3,16 @@
 Unit tests for local RAG engine.
 """
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from core import rag as rag_module
 from core.rag import (
     LocalRAGEngine,
     RAGSettings,
     build_rag_context,
+    get_engine,
     settings_from_api_config,
 )
 
@@ -108,3 +111,94 @@ def test_local_rag_retrieve_diversifies_by_file(tmp_path: Path):
     hits = engine.retrieve("disturbance observer control")
     assert len(hits) == 2
     assert len({h.path for h in hits}) == 2
+
+
+def test_local_rag_reuses_chunks_until_file_changes(tmp_path: Path):
+    kb = tmp_path / "kb"
+    kb.mkdir()
+    doc = kb / "a.md"
+    doc.write_text("Sliding mode control rejects matched disturbance.", encoding="utf-8")
+
+    settings = RAGSettings(
+        enabled=True,
+        top_k=1,
+        source_paths=(str(kb),),
+        include_globs=("*.md",),
+        chunk_size=500,
+        chunk_overlap=0,
+    )
+    first = LocalRAGEngine(settings).retrieve("sliding mode")
+    second = LocalRAGEngine(settings).retrieve("sliding mode")
+    assert first[0] is second[0]
+
+    doc.write_text("Sliding mode control with boundary layer reduces chattering.", encoding="utf-8")
+    stat = doc.stat()
+    os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    updated = LocalRAGEngine(settings).retrieve("sliding mode")
+    assert "chattering" in updated[0].text
+
+
+def test_engines_differing_in_retrieval_settings_share_index(tmp_path: Path):
+    kb = tmp_path / "kb"
+    kb.mkdir()
+    (kb / "a.md").write_text("Sliding mode control rejects matched disturbance.", encoding="utf-8")
+
+    base = RAGSettings(
+        enabled=True,
+        top_k=1,
+        source_paths=(str(kb),),
+        include_globs=("*.md",),
+        chunk_size=500,
+        chunk_overlap=0,
+    )
+    narrow = get_engine(base)
+    wide = get_engine(replace(base, top_k=3, min_score=0.2))
+    narrow.ensure_index()
+    wide.ensure_index()
+
+    assert narrow is not wide
+    assert narrow._corpus is wide._corpus
+
+
+def test_edited_knowledge_base_replaces_its_shared_corpus(tmp_path: Path):
+    kb = tmp_path / "kb"
+    kb.mkdir()
+    doc = kb / "a.md"
+    doc.write_text("Sliding mode control rejects matched disturbance.", encoding="utf-8")
+
+    settings = RAGSettings(
+        enabled=True,
+        source_paths=(str(kb),),
+        include_globs=("*.md",),
+        chunk_size=500,
+        chunk_overlap=0,
+    )
+    engine = LocalRAGEngine(settings)
+    engine.ensure_index()
+    first = engine._corpus
+
+    def cached_for_kb():
+        return [
+            corpus for (jobs, corpus) in rag_module._CORPUS_CACHE.values()
+            if any(path == str(doc) for path, _, _ in jobs)
+        ]
+
+    for i in range(3):
+        doc.write_text(f"Sliding mode control revision {i}.", encoding="utf-8")
+        stat = doc.stat()
+        os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + (i + 1) * 1_000_000))
+        engine.ensure_index()
+
+    assert engine._corpus is not first
+    assert cached_for_kb() == [engine._corpus]
+
+
+def test_build_rag_context_disabled_skips_sources(monkeypatch):
+    def fail_collect(*args, **kwargs):  # noqa: ARG001
+        raise AssertionError("sources must not be scanned when RAG is disabled")
+
+    monkeypatch.setattr("core.rag._collect_files", fail_collect)
+    cfg = DummyConfig(rag_enabled=False, rag_paths=["./docs"])
+
+    assert settings_from_api_config(cfg).enabled is False
+    assert build_rag_context("anything", cfg) == ""
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import os
 from dataclasses import dataclass, field
 
+import yaml
+
+from core import skills as skills_module
 from core.skills import build_local_skill_context
 
 
@@ -80,3 +84,72 @@ def test_build_local_skill_context_respects_priority_and_max_files(tmp_path):
     assert "Mid priority." in context
     assert "Low priority." not in context
     assert "[skill:High Priority Skill]" in context
+
+
+def test_build_local_skill_context_reuses_parsed_index_until_files_change(tmp_path, monkeypatch):
+    skill_file = tmp_path / "style.md"
+    skill_file.write_text("---\npriority: 1\n---\nFirst version.", encoding="utf-8")
+    cfg = DummySkillConfig(skill_enabled=True, skill_paths=[str(tmp_path)])
+
+    parsed = []
+    original = skills_module._split_frontmatter
+    monkeypatch.setattr(
+        skills_module,
+        "_split_frontmatter",
+        lambda text: parsed.append(text) or original(text),
+    )
+
+    assert "First version." in build_local_skill_context(cfg, "architect")
+    assert "First version." in build_local_skill_context(cfg, "engineer")
+    assert len(parsed) == 1
+
+    skill_file.write_text("---\npriority: 1\n---\nSecond version, edited.", encoding="utf-8")
+    stat = skill_file.stat()
+    os.utime(skill_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert "Second version, edited." in build_local_skill_context(cfg, "engineer")
+    assert len(parsed) == 2
+
+
+def test_flat_frontmatter_scanner_matches_yaml():
+    meta_raw = "\n".join([
+        "title: Sliding mode tips",
+        "priority: 10",
+        "offset: -3",
+        "agents: [theorist, engineer]",
+        "levels: [1, 2]",
+        "tags: []",
+        "# comment",
+        "name: 中文 技巧",
+    ])
+
+    parsed = skills_module._parse_flat_meta(meta_raw)
+
+    assert parsed is not None
+    assert parsed == yaml.safe_load(meta_raw)
+
+
+def test_ambiguous_frontmatter_values_fall_back_to_yaml():
+    headers = [
+        "priority: 012",
+        "priority: 0x1F",
+        "priority: 1_000",
+        "ratio: 1.5",
+        'title: "a\\tb"',
+        "title: 'quoted'",
+        "enabled: yes",
+        "enabled: no",
+        "enabled: on",
+        "enabled: true",
+        "value: null",
+        "value:",
+        "agents: [yes, theorist]",
+        "on: theorist",
+        "date: 2020-01-01",
+    ]
+    for meta_raw in headers:
+        assert skills_module._parse_flat_meta(meta_raw) is None, meta_raw
+        metadata, body = skills_module._split_frontmatter(f"---\n{meta_raw}\n---\nbody")
+        assert metadata == yaml.safe_load(meta_raw), meta_raw
+        assert body == "body"
+
@@ -8,10 +8,6 @@ import asyncio
 import threading
 import time
 
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from core.workflow_engine import WorkflowEngine, WorkflowState
 
 
@@ -25,6 +21,19 @@ class MockContext:
         pass
 
 
+def start_auto_confirmer(engine: WorkflowEngine, times: int = 1) -> asyncio.Task:
+    """在当前事件循环中创建确认任务：每收到一次确认请求就确认一次，共 times 次"""
+    requested: asyncio.Queue = asyncio.Queue()
+    engine.events.on("stage_confirmation_required", requested.put_nowait)
+
+    async def confirmer():
+        for _ in range(times):
+            await requested.get()
+            engine.confirm_stage()
+
+    return asyncio.create_task(confirmer())
+
+
 class TestWorkflowEngine:
     """WorkflowEngine 测试类"""
 
@@ -46,6 +55,7 @@ class TestWorkflowEngine:
         assert "test" in engine._stages
         assert engine._stage_descriptions["test"] == "测试阶段"
         assert engine._stage_progress["test"] == 50
+        assert engine._progress_schedule["test"] == ("测试阶段", 50)
 
     def test_chain_registration(self):
         """测试链式注册"""
@@ -72,14 +82,10 @@ class TestWorkflowEngine:
 
         engine.register_stage("stage1", handler, "阶段1", 100)
 
-        # 自动确认
-        def auto_confirm():
-            time.sleep(0.1)
-            engine.confirm_stage()
-
-        threading.Thread(target=auto_confirm, daemon=True).start()
+        confirmer = start_auto_confirmer(engine)
 
         result = await engine.run(context, ["stage1"])
+        await confirmer
 
         assert "stage1" in result.stages_executed
         assert engine.state == WorkflowState.COMPLETED
@@ -107,14 +113,10 @@ class TestWorkflowEngine:
         engine.register_stage("s3", handler3, "阶段3", 100)
 
         # 自动确认所有阶段
-        def auto_confirm():
-            for _ in range(3):
-                time.sleep(0.1)
-                engine.confirm_stage()
-
-        threading.Thread(target=auto_confirm, daemon=True).start()
+        confirmer = start_auto_confirmer(engine, times=3)
 
         result = await engine.run(context, ["s1", "s2", "s3"])
+        await confirmer
 
         assert result.stages_executed == ["s1", "s2", "s3"]
         assert engine.state == WorkflowState.COMPLETED
@@ -133,13 +135,31 @@ class TestWorkflowEngine:
         engine.register_stage("slow", slow_handler)
 
         # 立即停止
-        def stop_soon():
-            time.sleep(0.05)
+        asyncio.get_running_loop().call_later(0.05, engine.stop)
+
+        await engine.run(context, ["slow"])
+
+        assert engine.state == WorkflowState.STOPPED
+
+    @pytest.mark.asyncio
+    async def test_stop_during_supervisor_does_not_wait_for_confirmation(self):
+        """测试监督评估期间停止时不会卡在等待确认"""
+        engine = WorkflowEngine()
+        context = MockContext()
+
+        async def handler(ctx):
+            return ctx
+
+        async def supervisor(stage_key, ctx):
             engine.stop()
+            await asyncio.sleep(0)  # 让 stop() 安排的唤醒在等待确认之前执行
+            return None
 
-        threading.Thread(target=stop_soon, daemon=True).start()
+        engine.register_stage("s1", handler)
+        engine.register_stage("s2", handler)
+        engine.set_supervisor(supervisor)
 
-        await engine.run(context, ["slow"])
+        await asyncio.wait_for(engine.run(context, ["s1", "s2"]), timeout=2)
 
         assert engine.state == WorkflowState.STOPPED
 
@@ -165,16 +185,11 @@ class TestWorkflowEngine:
         engine.register_stage("s2", h2)
         engine.register_stage("s3", h3)
 
-        # 自动确认
-        def auto_confirm():
-            for _ in range(2):  # 只需确认 s2, s3
-                time.sleep(0.1)
-                engine.confirm_stage()
-
-        threading.Thread(target=auto_confirm, daemon=True).start()
+        confirmer = start_auto_confirmer(engine, times=2)  # 只需确认 s2, s3
 
         # 从索引 1 开始（跳过 s1）
         result = await engine.run(context, ["s1", "s2", "s3"], resume_index=1)
+        await confirmer
 
         assert "s1" not in result.stages_executed
         assert "s2" in result.stages_executed
@@ -196,13 +211,10 @@ class TestWorkflowEngine:
         engine.events.on("log_message", lambda e: events_received.append(("log", e.data)))
         engine.events.on("stage_completed", lambda e: events_received.append(("completed", e.data)))
 
-        def auto_confirm():
-            time.sleep(0.1)
-            engine.confirm_stage()
-
-        threading.Thread(target=auto_confirm, daemon=True).start()
+        confirmer = start_auto_confirmer(engine)
 
         await engine.run(context, ["test"])
+        await confirmer
 
         # 检查是否收到了预期的事件
         event_types = [e[0] for e in events_received]
@@ -221,12 +233,7 @@ class TestWorkflowEngine:
 
         engine.register_stage("fail", failing_handler)
 
-        def auto_confirm():
-            time.sleep(0.1)
-            engine.confirm_stage()
-
-        threading.Thread(target=auto_confirm, daemon=True).start()
-
+        # 阶段失败时不会请求确认
         await engine.run(context, ["fail"])
 
         assert engine.state == WorkflowState.ERROR